@@ -0,0 +1,130 @@
+# src/gcrbot/answer_cache.py
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def normalize_question(question):
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    q = re.sub(r"\s+", " ", question.lower()).strip()
+    return q.rstrip(" ?!.")
+
+
+def make_key(question, data, model_name=""):
+    """Cache key: normalized question + hash of the retrieved data block.
+
+    The data block comes from search_pfe(), so any change to the dataset
+    that affects the answer also changes the key.
+    """
+    data_hash = hashlib.sha256(data.encode("utf-8")).hexdigest()
+    raw = "\x00".join([model_name, normalize_question(question), data_hash])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """In-memory LRU in front of a persistent SQLite table.
+
+    Entries expire after ttl seconds; each tier is trimmed to its size
+    limit, least recently used first. Pass path=None for memory only.
+    """
+
+    def __init__(self, path=None, ttl=86400, memory_size=256, disk_size=10000):
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = None
+
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers(last_used)")
+            self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, answer = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self.hits["memory"] += 1
+                    return answer
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT answer, expires FROM answers WHERE key = ? AND expires > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE answers SET last_used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[1], row[0])
+                    self.hits["disk"] += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, answer):
+        now = time.time()
+        expires = now + self.ttl
+        with self._lock:
+            self._remember(key, expires, answer)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers (key, answer, expires, last_used) VALUES (?, ?, ?, ?)",
+                (key, answer, expires, now),
+            )
+            # Trimming scans the table, so only do it every 100 writes
+            self._writes += 1
+            if self._writes % 100 == 1:
+                self._db.execute("DELETE FROM answers WHERE expires <= ?", (now,))
+                self._db.execute(
+                    "DELETE FROM answers WHERE key IN ("
+                    "SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_size,),
+                )
+            self._db.commit()
+
+    def _remember(self, key, expires, answer):
+        self._memory[key] = (expires, answer)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM answers")
+                self._db.commit()
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            hits = self.hits["memory"] + self.hits["disk"]
+            total = hits + self.misses
+            disk_entries = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0] if self._db else 0
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_ratio": round(hits / total, 4) if total else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
@@ -1,14 +1,82 @@
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent))
+# src/ on the path so the API and gemini_tool share one gcrbot.tools.db_tool (and one dataset)
+sys.path.append(str(Path(__file__).parent.parent))
 
-from flask import Flask, request, jsonify
-from tools import db_tool
+from dotenv import load_dotenv
+load_dotenv()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from gcrbot import metrics
+from gcrbot.tools import db_tool, render, taxonomy
 import pandas as pd
+import base64
+import hashlib
+import json
+import os
 import re
+import time
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up (pip install orjson); the standard json module is used without it
+    orjson = None
 
 app = Flask(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask's JSON encoding done by orjson: several times faster on large answers, numpy scalars included"""
+
+    def _encode(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        # Bytes straight into the response, without the str round trip of the default provider
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent) + b"\n", mimetype=self.mimetype)
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# Each request works on one dataset snapshot, even if a reload lands mid-request
+@app.before_request
+def pin_dataset():
+    g.request_start = time.perf_counter()
+    with metrics.stage("pin_dataset"):
+        db_tool.pin_snapshot()
+
+@app.after_request
+def add_dataset_version(response):
+    # Lets clients key their caches by dataset version
+    version = db_tool.dataset_version()
+    if version:
+        response.headers["X-Dataset-Version"] = version
+    return response
+
+@app.after_request
+def record_request(response):
+    # Latency up to the response headers (a streamed body is timed by its own stages)
+    start = g.get("request_start")
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, request.method, endpoint)
+        metrics.REQUESTS.inc(request.method, endpoint, str(response.status_code))
+    return response
+
+@app.teardown_request
+def unpin_dataset(exc):
+    db_tool.unpin_snapshot()
+
 # ---------------------------
 # Enhanced bilingual search with professional output
 # ---------------------------
@@ -19,114 +87,271 @@ def predict():
         return jsonify({"error": "Missing 'question'"}), 400
     
     question = data["question"].lower()
-    
-    # Load database
-    df = db_tool.load_data()
-    if df is None:
+    limit = parse_limit(data)
+    if limit is None:
+        return jsonify({"error": f"'limit' must be an integer from 1 to {MAX_PREDICT_LIMIT}"}), 400
+    mode = data.get("mode", "keyword")
+    if mode not in db_tool.SEARCH_MODES:
+        return jsonify({"error": f"'mode' must be one of {', '.join(db_tool.SEARCH_MODES)}"}), 400
+    output = data.get("format", "markdown")
+    if output not in PREDICT_FORMATS:
+        return jsonify({"error": f"'format' must be one of {', '.join(PREDICT_FORMATS)}"}), 400
+    
+    # Check the database is loaded
+    if db_tool.dataset_version() is None:
         return jsonify({"answer": "Database currently unavailable. Please try again later."}), 500
     
-    # Bilingual keyword mapping (French/English)
-    keyword_mappings = {
-        "ai": ["ai", "ia", "intelligence artificielle", "artificial intelligence", "machine learning", "deep learning", "ml"],
-        "cybersecurity": ["cybersecurity", "cyber security", "cybersécurité", "cyber-sécurité", "sécurité", "security", "siem", "soar", "pentest"],
-        "blockchain": ["blockchain", "iota", "crypto", "dlc", "distributed ledger"],
-        "network": ["network", "réseau", "networking", "sd-wan", "cisco", "routing"],
-        "web": ["web", "website", "site web", "platform", "plateforme", "angular", "react", "spring"],
-        "iot": ["iot", "internet of things", "internet des objets", "embedded"],
-        "automation": ["automation", "automatisation", "automate", "automated"],
-        "mobile": ["mobile", "4g", "5g", "telecommunications", "télécommunications"],
-        "cloud": ["cloud", "iaac", "devops", "orchestration", "terraform"],
-        "quality": ["quality", "qualité", "testing", "qa", "test"]
-    }
-    
-    # Detect domain from question
-    detected_domain = None
-    for domain, keywords in keyword_mappings.items():
-        if any(keyword in question for keyword in keywords):
-            detected_domain = domain
-            break
+    # A cursor continues a listing where the previous page stopped, on the same dataset version
+    offset = 0
+    if data.get("cursor") is not None:
+        decoded = decode_cursor(data["cursor"])
+        if decoded is None:
+            return jsonify({"error": "'cursor' is not a valid cursor"}), 400
+        offset, version = decoded
+        if version != db_tool.dataset_version():
+            return jsonify({"error": "The data changed since this cursor was issued; repeat the query without 'cursor'"}), 409
+    
+    with metrics.stage("detect_intent"):
+        intent = detect_intent(question, mode)
+    with metrics.stage("render_answer"):
+        # Only the requested page is fetched and formatted
+        page = fetch_page(intent, limit, offset) if intent[0] in LISTING_INTENTS else None
+        if output == "json":
+            body = answer_records(intent, page)
+        else:
+            body = {"answer": render_answer(intent, limit, offset, page)}
+        if page is not None:
+            projects, _, total = page
+            end = offset + len(projects)
+            body["total"] = total
+            body["next_cursor"] = encode_cursor(end, db_tool.dataset_version()) if end < total else None
+    with metrics.stage("json_encode"):
+        return jsonify(body)
+
+MAX_BATCH_QUESTIONS = 200
+
+# Projects listed per answer, best matches first (overridable per request with "limit")
+PREDICT_LIMIT = int(os.getenv("PFE_PREDICT_LIMIT", "20"))
+# Largest "limit" a request may ask for, on either backend
+MAX_PREDICT_LIMIT = 1000
+
+# "markdown" answers for people, "json" project records for programs
+PREDICT_FORMATS = ("markdown", "json")
+
+# Intents whose answer is a list of projects, and so can be paged
+LISTING_INTENTS = ("domain", "search", "semantic", "list_all")
+
+def parse_limit(data):
+    """'limit' from the request body (1 to MAX_PREDICT_LIMIT), the default if absent, None if invalid"""
+    limit = data.get("limit", PREDICT_LIMIT)
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_PREDICT_LIMIT:
+        return None
+    return limit
+
+def encode_cursor(offset, version):
+    """Opaque token for the page starting at offset, tied to one dataset version"""
+    return base64.urlsafe_b64encode(f"{offset}:{version}".encode("ascii")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor):
+    """(offset, dataset version) from encode_cursor(), None if malformed"""
+    if not isinstance(cursor, str):
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        offset, version = raw.split(":", 1)
+        offset = int(offset)
+    except ValueError:  # Also binascii.Error and UnicodeDecodeError
+        return None
+    # SQLite takes offsets as 64-bit integers
+    return (offset, version) if 0 <= offset < 2 ** 63 else None
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """
+    Answer a list of questions in one call, results in request order
+    """
+    data = request.get_json()
+    questions = data.get("questions") if isinstance(data, dict) else None
+    if not isinstance(questions, list) or not all(isinstance(q, str) for q in questions):
+        return jsonify({"error": "'questions' must be a list of strings"}), 400
+    if len(questions) > MAX_BATCH_QUESTIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_QUESTIONS} questions per batch"}), 400
+    limit = parse_limit(data)
+    if limit is None:
+        return jsonify({"error": f"'limit' must be an integer from 1 to {MAX_PREDICT_LIMIT}"}), 400
+    mode = data.get("mode", "keyword")
+    if mode not in db_tool.SEARCH_MODES:
+        return jsonify({"error": f"'mode' must be one of {', '.join(db_tool.SEARCH_MODES)}"}), 400
+    
+    if db_tool.dataset_version() is None:
+        return jsonify({"error": "Database unavailable"}), 500
     
-    # Build response
-    results = []
+    # Questions with the same intent (same domain, same count...) share one rendered answer
+    with metrics.stage("detect_intent"):
+        intents = [detect_intent(q.lower(), mode) for q in questions]
+    with metrics.stage("render_answer"):
+        answers = {intent: render_answer(intent, limit) for intent in dict.fromkeys(intents)}
+    
+    with metrics.stage("json_encode"):
+        return jsonify({
+            "answers": [
+                {"question": q, "answer": answers[intent]}
+                for q, intent in zip(questions, intents)
+            ]
+        })
+
+def detect_intent(question, mode="keyword"):
+    """
+    Reduce a lowercased question to a hashable key that fully determines its answer
+    """
+    # Semantic mode: nearest projects by TF-IDF similarity, whatever the wording
+    if mode == "semantic":
+        return ("semantic", " ".join(question.split()))
     
-    if detected_domain:
-        # Search using all synonyms for the detected domain
-        search_terms = keyword_mappings[detected_domain]
-        pattern = '|'.join(search_terms)
-        
-        mask = df['title_lower'].str.contains(pattern, case=False, na=False, regex=True) | \
-               df['specialty_lower'].str.contains(pattern, case=False, na=False, regex=True)
-        
-        projects = df[mask]
-        
-        if not projects.empty:
-            results.append(f"**{detected_domain.upper()} Projects Found: {len(projects)} project(s)**\n")
-            
-            for idx, (_, row) in enumerate(projects.iterrows(), 1):
-                results.append(f"{idx}. **Student:** {row['student']}")
-                results.append(f"   **Title:** {row['title']}")
-                results.append(f"   **Specialty:** {row['specialty']}")
-                results.append(f"   **Year:** {row['year']}\n")
-        else:
-            results.append(f"No {detected_domain} projects found in the database.")
+    # Detect domain from question (bilingual taxonomy, whole words). The domain
+    # mentioned first in the question wins, whatever its place in taxonomy.DOMAINS
+    domains = taxonomy.domains(question)
+    if domains:
+        # The remaining words rank the domain's projects
+        return ("domain", domains[0], tuple(sorted(set(db_tool.query_terms(question)))))
     
     # Handle "how many" questions
-    elif any(phrase in question for phrase in ["how many", "combien", "number of", "nombre de"]):
+    if any(phrase in question for phrase in ["how many", "combien", "number of", "nombre de"]):
         if any(word in question for word in ["total", "tous", "all", "projects", "projets"]):
-            total = len(df)
-            results.append(f"**Total Projects:** {total}")
-        elif any(word in question for word in ["specialty", "specialties", "spécialité", "spécialités"]):
-            specialty_counts = df['specialty'].value_counts()
-            results.append("**Projects by Specialty:**\n")
-            for spec, count in specialty_counts.items():
-                results.append(f"• {spec}: {count} project(s)")
-        else:
-            # Try to find specialty name in question
-            for specialty in df['specialty'].unique():
-                if specialty.lower() in question:
-                    count = len(df[df['specialty'] == specialty])
-                    results.append(f"**{specialty}:** {count} project(s)")
-                    break
+            return ("count_total",)
+        if any(word in question for word in ["specialty", "specialties", "spécialité", "spécialités"]):
+            return ("count_by_specialty",)
+        # Try to find specialty name in question
+        for specialty in db_tool.value_counts('specialty'):
+            if specialty.lower() in question:
+                return ("count_specialty", specialty)
+        return ("none",)
     
     # Handle "list" or "show" questions
-    elif any(word in question for word in ["list", "show", "liste", "affiche", "display"]):
+    if any(word in question for word in ["list", "show", "liste", "affiche", "display"]):
         if any(word in question for word in ["all", "tous", "everything"]):
-            results.append(f"**All Projects ({len(df)} total):**\n")
-            for idx, (_, row) in enumerate(df.iterrows(), 1):
-                results.append(f"{idx}. {row['student']} - {row['title']} ({row['specialty']})")
-                if idx >= 20:  # Limit to first 20 for readability
-                    results.append(f"\n... and {len(df) - 20} more projects")
-                    break
+            return ("list_all",)
+        return ("none",)
     
     # Fallback: general keyword search
-    else:
-        # Extract potential search terms (remove common words)
-        stopwords = ["what", "is", "are", "the", "a", "an", "in", "on", "for", "with", "about",
-                     "quel", "quelle", "est", "sont", "le", "la", "les", "un", "une", "dans", "sur", "pour"]
-        search_words = [w for w in question.split() if w not in stopwords and len(w) > 3]
-        
-        if search_words:
-            pattern = '|'.join(search_words)
-            mask = df['title_lower'].str.contains(pattern, case=False, na=False, regex=True) | \
-                   df['specialty_lower'].str.contains(pattern, case=False, na=False, regex=True) | \
-                   df['student'].str.lower().str.contains(pattern, case=False, na=False, regex=True)
-            
-            projects = df[mask]
-            
-            if not projects.empty:
-                results.append(f"**Search Results: {len(projects)} project(s) found**\n")
-                for idx, (_, row) in enumerate(projects.iterrows(), 1):
-                    results.append(f"{idx}. **Student:** {row['student']}")
-                    results.append(f"   **Title:** {row['title']}")
-                    results.append(f"   **Specialty:** {row['specialty']}")
-                    results.append(f"   **Year:** {row['year']}\n")
-            else:
-                results.append("No matching projects found. Please try different keywords.")
+    # Extract potential search terms (remove common words, same FR/EN list as the search ranking)
+    search_words = [w for w in question.split() if w not in taxonomy.STOPWORDS and len(w) > 3]
+    if search_words:
+        return ("search", tuple(search_words))
+    return ("help",)
+
+def fetch_page(intent, limit=PREDICT_LIMIT, offset=0):
+    """
+    One page of the projects a listing intent returns: (projects, similarity scores or None, total)
+    """
+    kind = intent[0]
+    if kind == "domain":
+        # Projects were tagged with their domains at load time, best BM25 matches first
+        projects, total = db_tool.search_ranked(" ".join(intent[2]), domain=intent[1], limit=limit, offset=offset)
+        return projects, None, total
+    if kind == "search":
+        projects, total = db_tool.search_ranked(" ".join(intent[1]), terms=list(intent[1]),
+                                                fields=("title", "specialty", "student"), limit=limit, offset=offset)
+        return projects, None, total
+    if kind == "semantic":
+        return db_tool.search_semantic(intent[1], limit=limit, offset=offset)
+    if kind == "list_all":
+        return db_tool.list_projects(offset, limit), None, db_tool.project_count()
+    raise ValueError(f"Not a listing intent: {kind}")
+
+def page_header(title, total, offset, shown, noun="project(s)"):
+    """Bold result header; later pages also say which projects they show"""
+    if offset and shown:
+        return f"**{title}: {total} {noun}** (showing {offset + 1}-{offset + shown})\n"
+    return f"**{title}: {total} {noun}**\n"
+
+def render_answer(intent, limit=PREDICT_LIMIT, offset=0, page=None):
+    """
+    Build the Markdown answer for an intent from detect_intent(), listing at most limit projects from offset on
+    """
+    kind = intent[0]
+    results = []
+    if kind in LISTING_INTENTS and page is None:
+        page = fetch_page(intent, limit, offset)
+    projects, scores, total = page if page is not None else (None, None, 0)
+    remaining = total - offset - (len(projects) if projects is not None else 0)
+    
+    if kind == "domain":
+        detected_domain = intent[1]
+        if total:
+            results.append(page_header(f"{detected_domain.upper()} Projects Found", total, offset, len(projects)))
+            results.extend(render.project_blocks(projects, offset + 1))
+            if remaining > 0:
+                results.append(f"... and {remaining} more projects")
+        else:
+            results.append(f"No {detected_domain} projects found in the database.")
+    
+    elif kind == "count_total":
+        results.append(f"**Total Projects:** {db_tool.project_count()}")
+    
+    elif kind == "count_by_specialty":
+        specialty_counts = db_tool.value_counts('specialty')
+        results.append("**Projects by Specialty:**\n")
+        for spec, count in specialty_counts.items():
+            results.append(f"• {spec}: {count} project(s)")
+    
+    elif kind == "count_specialty":
+        specialty = intent[1]
+        count = db_tool.value_counts('specialty').get(specialty, 0)
+        results.append(f"**{specialty}:** {count} project(s)")
+    
+    elif kind == "list_all":
+        if offset and len(projects):
+            results.append(f"**All Projects ({total} total, showing {offset + 1}-{offset + len(projects)}):**\n")
+        else:
+            results.append(f"**All Projects ({total} total):**\n")
+        results.extend(render.project_lines(projects, offset + 1))
+        if remaining > 0:
+            results.append(f"\n... and {remaining} more projects")
+    
+    elif kind == "search":
+        if total:
+            results.append(page_header("Search Results", total, offset, len(projects), "project(s) found"))
+            results.extend(render.project_blocks(projects, offset + 1))
+            if remaining > 0:
+                results.append(f"... and {remaining} more projects")
+        else:
+            results.append("No matching projects found. Please try different keywords.")
+    
+    elif kind == "semantic":
+        if total:
+            results.append(page_header("Closest Projects", total, offset, len(projects)))
+            results.extend(render.project_blocks(projects, offset + 1, "Similarity",
+                                                 [f"{score:.0%}" for score in scores.tolist()]))
+            if remaining > 0:
+                results.append(f"... and {remaining} more projects")
         else:
-            results.append("Please provide more specific search terms (e.g., AI, cybersecurity, blockchain, web, networking).")
+            results.append("No similar projects found. Please try different keywords.")
     
-    final_answer = "\n".join(results) if results else "No relevant information found. Please refine your query."
-    return jsonify({"answer": final_answer})
+    elif kind == "help":
+        results.append("Please provide more specific search terms (e.g., AI, cybersecurity, blockchain, web, networking).")
+    
+    return "\n".join(results) if results else "No relevant information found. Please refine your query."
+
+def answer_records(intent, page=None):
+    """
+    Structured answer for format=json: project records for listings, counts otherwise
+    """
+    kind = intent[0]
+    body = {"intent": kind}
+    if kind in LISTING_INTENTS:
+        projects, scores, _ = page
+        extra = {} if scores is None else {"similarity": [round(score, 4) for score in scores.tolist()]}
+        body["results"] = render.records(projects, **extra)
+    elif kind == "count_total":
+        body["count"] = db_tool.project_count()
+    elif kind == "count_by_specialty":
+        body["counts"] = {str(spec): int(count) for spec, count in db_tool.value_counts('specialty').items()}
+    elif kind == "count_specialty":
+        body["counts"] = {intent[1]: int(db_tool.value_counts('specialty').get(intent[1], 0))}
+    else:
+        body["answer"] = render_answer(intent)
+    return body
 
 @app.route("/recommend", methods=["POST"])
 def recommend_topic():
@@ -163,47 +388,63 @@ def recommend_topic():
 # ---------------------------
 # Enhanced stats with more dashboards
 # ---------------------------
+# Serialized /stats payload for one dataset version: (version, body, etag)
+_stats_cache = (None, None, None)
+STATS_CACHE = metrics.register(metrics.Counter("pfe_stats_cache_total", "Lookups of the cached /stats payload",
+                                               ["result"]))
+
 @app.route("/stats", methods=["GET"])
 def stats():
-    df = db_tool.load_data()
-    if df is None:
+    global _stats_cache
+    version = db_tool.dataset_version()
+    if version is None:
         return jsonify({"error": "Database unavailable"}), 500
 
+    # Aggregates only change with the data, so compute and encode them once per version
+    cached_version, body, etag = _stats_cache
+    if cached_version != version:
+        STATS_CACHE.inc("miss")
+        with metrics.stage("compute_stats"):
+            body = app.json.dumps(compute_stats()).encode("utf-8")
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        _stats_cache = (version, body, etag)
+    else:
+        STATS_CACHE.inc("hit")
+
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def compute_stats():
+    """Aggregate analytics for the dashboard (grouped counts, indexed SQL with the sqlite backend)"""
     # Basic counts
-    total_projects = len(df)
-    by_specialty = df['specialty'].value_counts().to_dict()
-    by_year = df['year'].value_counts().to_dict()
+    total_projects = db_tool.project_count()
+    by_specialty = db_tool.value_counts('specialty')
+    by_year = db_tool.value_counts('year')
     
     # Additional analytics
     # 1. Top students with most projects
-    by_student = df['student'].value_counts().head(10).to_dict()
+    by_student = db_tool.value_counts('student', limit=10)
     
     # 2. Projects per year trend
-    year_trend = df.groupby('year').size().to_dict()
+    year_trend = dict(sorted(by_year.items()))
     
     # 3. Specialty distribution percentage
-    specialty_percentage = (df['specialty'].value_counts() / total_projects * 100).round(2).to_dict()
+    specialty_percentage = {spec: round(count / total_projects * 100, 2) for spec, count in by_specialty.items()}
     
     # 4. Average projects per specialty
-    avg_per_specialty = len(df) / len(df['specialty'].unique())
-    
-    # 5. Domain keywords analysis
-    domain_counts = {}
-    keywords = {
-        "AI/ML": ["ai", "machine learning", "intelligent", "learning"],
-        "Security": ["security", "cyber", "siem"],
-        "Network": ["network", "sd-wan", "routing"],
-        "Web": ["web", "platform", "website"],
-        "Automation": ["automation", "automated"],
-        "Cloud": ["cloud", "iaac", "orchestration"],
-        "Blockchain": ["blockchain", "iota"],
-        "IoT": ["iot", "embedded"]
-    }
+    avg_per_specialty = total_projects / len(by_specialty)
     
-    for domain, terms in keywords.items():
-        pattern = '|'.join(terms)
-        count = df['title_lower'].str.contains(pattern, case=False, na=False, regex=True).sum()
-        domain_counts[domain] = int(count)
+    # 5. Domain keywords analysis: one entry per taxonomy domain, counting the
+    # projects whose title or specialty mentions one of its keywords as a whole word
+    domain_counts = {
+        taxonomy.domain_label(domain): db_tool.count_domain(domain)
+        for domain in taxonomy.DOMAINS
+    }
 
     stats = {
         "total_projects": total_projects,
@@ -216,11 +457,22 @@ def stats():
         "year_trend": year_trend
     }
     
-    return jsonify(stats)
+    return stats
 
 # ---------------------------
 # Profile-based recommendation
 # ---------------------------
+PROFILE_REASONS = {
+    "ai": "Matches your AI/ML skills",
+    "network": "Matches your networking expertise",
+    "cybersecurity": "Matches your security skills",
+    "web": "Matches your web development skills",
+    "cloud": "Matches your cloud/DevOps skills",
+    "blockchain": "Matches your blockchain interest",
+    "iot": "Matches your IoT skills",
+    "automation": "Matches your automation skills"
+}
+
 @app.route("/profile_recommend", methods=["POST"])
 def profile_recommend():
     data = request.get_json()
@@ -230,90 +482,16 @@ def profile_recommend():
     interests = data.get("interests", "").lower()
     level = data.get("level", "").lower()
     
-    df = db_tool.load_data()
-    if df is None:
+    if db_tool.dataset_version() is None:
         return jsonify({"error": "Database unavailable"}), 500
     
-    project_scores = []
-    
-    for idx, row in df.iterrows():
-        score = 0
-        reasons = []
-        title_lower = row['title'].lower()
-        specialty_lower = row['specialty'].lower()
-        
-        # AI/ML matching
-        if any(k in skills for k in ["python", "ml", "machine learning", "deep learning", "ai"]) or "ai" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["ai", "machine learning", "intelligent", "learning"]):
-                score += 3
-                reasons.append("Matches your AI/ML skills")
-        
-        # Networking matching
-        if any(k in skills for k in ["network", "routing", "switching", "cisco", "sd-wan"]) or "ccna" in certifications or "networking" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["network", "sd-wan", "routing", "cisco"]):
-                score += 3
-                reasons.append("Matches your networking expertise")
-        
-        # Cybersecurity matching
-        if any(k in skills for k in ["security", "cyber", "siem", "soar", "pentest"]) or "cybersecurity" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["security", "cyber", "siem", "soar"]):
-                score += 3
-                reasons.append("Matches your security skills")
-        
-        # Web development matching
-        if any(k in skills for k in ["web", "html", "react", "angular", "django", "spring"]) or "web" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["web", "platform", "angular", "spring"]):
-                score += 3
-                reasons.append("Matches your web development skills")
-        
-        # Cloud/DevOps matching
-        if any(k in skills for k in ["cloud", "devops", "docker", "kubernetes", "terraform"]) or any(k in certifications for k in ["oci", "aws", "azure"]):
-            if any(k in title_lower or k in specialty_lower for k in ["iaac", "cloud", "orchestr", "automation"]):
-                score += 3
-                reasons.append("Matches your cloud/DevOps skills")
-        
-        # Blockchain matching
-        if any(k in skills for k in ["blockchain", "iota", "crypto"]) or "blockchain" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["blockchain", "iota"]):
-                score += 3
-                reasons.append("Matches your blockchain interest")
-        
-        # IoT matching
-        if any(k in skills for k in ["iot", "embedded", "sensor"]) or "iot" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["iot", "embedded"]):
-                score += 3
-                reasons.append("Matches your IoT skills")
-        
-        # Automation matching
-        if any(k in skills for k in ["automation", "scripting", "ansible"]) or "automation" in interests:
-            if any(k in title_lower or k in specialty_lower for k in ["automation", "automated"]):
-                score += 3
-                reasons.append("Matches your automation skills")
-        
-        # Level adjustment
-        complexity_keywords = ["implementation", "design", "optimization", "intelligent", "advanced"]
-        is_complex = any(k in title_lower for k in complexity_keywords)
-        
-        if level == "beginner" and not is_complex:
-            score += 1
-        elif level == "advanced" and is_complex:
-            score += 1
-        elif level == "intermediate":
-            score += 0.5
-        
-        if score > 0:
-            project_scores.append({
-                "student": row['student'],
-                "title": row['title'],
-                "specialty": row['specialty'],
-                "score": score,
-                "reasons": reasons
-            })
-    
-    project_scores.sort(key=lambda x: x['score'], reverse=True)
-    top_projects = project_scores[:5]
-    
-    if not top_projects:
+    # Domains the student points to through skills, certifications or interests
+    profile_tags = taxonomy.tag(" ".join([skills, certifications, interests]))
+    profile_domains = set(profile_tags["domain"]) | set(profile_tags["hint"])
+    
+    top_projects, _, total_matches = db_tool.score_profile(profile_domains, level, k=5)
+    
+    if top_projects.empty:
         suggestions = [
             {
                 "title": "General software development project adapted to your profile",
@@ -321,19 +499,25 @@ def profile_recommend():
             }
         ]
     else:
+        # Reasons are only built for the returned projects
         suggestions = [
             {
-                "student": p['student'],
-                "title": p['title'],
-                "specialty": p['specialty'],
-                "match_reasons": p['reasons']
+                "student": student,
+                "title": title,
+                "specialty": specialty,
+                "match_reasons": [
+                    PROFILE_REASONS.get(domain, f"Matches your {taxonomy.domain_label(domain)} interest")
+                    for domain in domains if domain in profile_domains
+                ]
             }
-            for p in top_projects
+            for student, title, specialty, domains in zip(
+                top_projects['student'].tolist(), top_projects['title'].tolist(),
+                top_projects['specialty'].tolist(), top_projects['domains'].tolist())
         ]
     
     return jsonify({
         "suggestions": suggestions,
-        "total_matches": len(project_scores)
+        "total_matches": total_matches
     })
 
 # ---------------------------
@@ -355,16 +539,21 @@ def compare_projects():
     if not project1_query or not project2_query:
         return jsonify({"error": "Project titles cannot be empty"}), 400
     
-    # Get detailed information for both projects
-    info1 = db_tool.get_project_comparison_info(project1_query)
-    info2 = db_tool.get_project_comparison_info(project2_query)
-    
-    # Check if projects were found
-    if info1 is None:
-        return jsonify({"error": f"Project 1 not found: '{project1_query}'"}), 404
-    
-    if info2 is None:
-        return jsonify({"error": f"Project 2 not found: '{project2_query}'"}), 404
+    # Resolve both titles (typo tolerant); ambiguous input gets ranked candidates back
+    info1, candidates1 = db_tool.resolve_project(project1_query)
+    info2, candidates2 = db_tool.resolve_project(project2_query)
+    
+    for number, query, info, candidates in ((1, project1_query, info1, candidates1),
+                                            (2, project2_query, info2, candidates2)):
+        if info is None and candidates:
+            return jsonify({
+                "error": f"Project {number} is ambiguous: '{query}'",
+                "field": f"project{number}",
+                "candidates": candidates
+            }), 409
+        if info is None:
+            return jsonify({"error": f"Project {number} not found: '{query}'", "field": f"project{number}",
+                            "candidates": []}), 404
     
     # Calculate similarity score
     similarity_score = db_tool.calculate_similarity_score(info1, info2)
@@ -411,6 +600,78 @@ def compare_projects():
         "recommendation": recommendation
     })
 
+# ---------------------------
+# Similar projects (precomputed neighbour graph)
+# ---------------------------
+@app.route("/similar", methods=["POST"])
+def similar():
+    """
+    Nearest projects to a given one, read from the graph built at load time
+    """
+    data = request.get_json()
+    if not data or not str(data.get("project", "")).strip():
+        return jsonify({"error": "Missing 'project'"}), 400
+    
+    query = str(data["project"]).strip()
+    limit = data.get("limit", db_tool.SIMILAR_K)
+    # The graph keeps SIMILAR_K neighbours per project, so no larger list exists
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= db_tool.SIMILAR_K:
+        return jsonify({"error": f"'limit' must be an integer from 1 to {db_tool.SIMILAR_K}"}), 400
+    
+    info, neighbors, candidates = db_tool.similar_projects(query, limit=limit)
+    if info is None and candidates:
+        return jsonify({"error": f"Project is ambiguous: '{query}'", "field": "project",
+                        "candidates": candidates}), 409
+    if info is None:
+        return jsonify({"error": f"Project not found: '{query}'", "field": "project", "candidates": []}), 404
+    
+    return jsonify({"project": info, "similar": neighbors})
+
+# ---------------------------
+# Prometheus metrics
+# ---------------------------
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """
+    Stage and request latency histograms, cache counters and dataset size
+    """
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ---------------------------
+# Streaming AI answer (Server-Sent Events)
+# ---------------------------
+def sse(data, event=None):
+    """Format one Server-Sent Event; data is JSON-encoded so newlines are safe"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+@app.route("/ask/stream", methods=["POST"])
+def ask_stream():
+    """
+    Stream the Gemini answer to a question as it is generated
+    """
+    data = request.get_json()
+    if not data or not data.get("question", "").strip():
+        return jsonify({"error": "Missing 'question'"}), 400
+    question = data["question"].strip()
+
+    # Imported on first use: loading the Gemini SDK is only needed for this endpoint
+    from gcrbot import gemini_tool
+
+    def generate():
+        try:
+            for text in gemini_tool.stream_gemini(question):
+                yield sse(text)
+            yield sse({}, event="done")
+        except Exception as e:
+            yield sse(f"Error: {e}", event="error")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 def generate_recommendation(info1, info2, similarity_score):
     """
     Generate an intelligent recommendation based on project comparison
@@ -0,0 +1,143 @@
+# src/gcrbot/api_client.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Answers worth retrying: the API or a proxy in front of it is briefly unavailable
+RETRY_STATUSES = {502, 503, 504}
+
+
+class APIError(Exception):
+    """Non-success answer from the API"""
+
+    def __init__(self, status_code, message=""):
+        super().__init__(message or f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APIClient:
+    """Shared HTTP client for the Streamlit front end.
+
+    One pooled keep-alive session, connect/read timeouts and bounded
+    retries with backoff. Read-mostly endpoints are cached for `cache_ttl`
+    seconds and keyed by the dataset version the API reports in its
+    X-Dataset-Version header, so an entry is dropped as soon as any answer
+    shows the data changed.
+    """
+
+    def __init__(self, base_url, timeout=(3.05, 30), stream_timeout=(3.05, 120), retries=2, backoff=0.3,
+                 cache_ttl=60, pool_size=8):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.stream_timeout = stream_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self.dataset_version = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="api-client")
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------
+    # Requests
+    # ---------------------------
+    def request(self, method, path, retry=True, **kwargs):
+        """Send a request; connection errors and RETRY_STATUSES are retried when retry is set"""
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = self.session.request(method, self.base_url + path, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    self._note_version(response)
+                    return response
+                response.close()
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, payload, **kwargs):
+        return self.request("POST", path, json=payload, **kwargs)
+
+    def stream(self, path, payload):
+        """Streamed POST (use as a context manager); never retried, the answer may already be under way"""
+        return self.request("POST", path, retry=False, json=payload, stream=True, timeout=self.stream_timeout)
+
+    def gather(self, *calls):
+        """Run independent zero-argument calls concurrently, results in call order"""
+        futures = [self._pool.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    # ---------------------------
+    # Cached read-mostly endpoints
+    # ---------------------------
+    def stats(self):
+        """/stats payload; revalidated with its ETag once the TTL runs out"""
+        entry = self._cached("stats")
+        if entry is not None and entry["fresh"]:
+            return entry["value"]
+
+        headers = {"If-None-Match": entry["etag"]} if entry else {}
+        response = self.get("/stats", headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self._store("stats", entry["value"], entry["etag"])
+            return entry["value"]
+        if response.status_code != 200:
+            raise APIError(response.status_code)
+        value = response.json()
+        self._store("stats", value, response.headers.get("ETag", ""))
+        return value
+
+    def recommend(self, domain):
+        """/recommend suggestions for a domain"""
+        key = ("recommend", domain.lower())
+        entry = self._cached(key)
+        if entry is not None and entry["fresh"]:
+            return entry["value"]
+        response = self.post("/recommend", {"domain": domain})
+        if response.status_code != 200:
+            raise APIError(response.status_code)
+        value = response.json()
+        self._store(key, value)
+        return value
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _note_version(self, response):
+        version = response.headers.get("X-Dataset-Version")
+        if version:
+            with self._lock:
+                self.dataset_version = version
+
+    def _cached(self, key):
+        """Entry for key if it belongs to the current dataset version, with fresh = within TTL"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry["version"] != self.dataset_version:
+                return None
+            return dict(entry, fresh=entry["expires"] > time.monotonic())
+
+    def _store(self, key, value, etag=None):
+        with self._lock:
+            self._cache[key] = {
+                "value": value,
+                "etag": etag,
+                "version": self.dataset_version,
+                "expires": time.monotonic() + self.cache_ttl,
+            }
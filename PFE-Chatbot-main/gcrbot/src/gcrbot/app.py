@@ -1,17 +1,32 @@
+import sys
+from pathlib import Path
+# src/ on the path so the shared API client imports when run with `streamlit run app.py`
+sys.path.append(str(Path(__file__).parent.parent))
+
 import streamlit as st
 import requests
+import json
+from functools import partial
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from gcrbot.api_client import APIClient, APIError
 
 API_BASE_URL = "http://127.0.0.1:5000"
 st.set_page_config(page_title="AI-Powered PFE Assistant", layout="wide", page_icon="🎓")
 
+@st.cache_resource
+def get_client():
+    """One pooled, caching API client shared by every session and rerun"""
+    return APIClient(API_BASE_URL)
+
+client = get_client()
+
 # Sidebar with modern styling
 st.sidebar.title("🎓 Navigation")
 option = st.sidebar.selectbox(
     "Choose an option:",
-    ["Search by Question", "Topic Suggestions", "Profile-Based Recommendations", "Compare Two Projects", "Analytics Dashboard"]
+    ["Search by Question", "Ask the AI Assistant", "Topic Suggestions", "Profile-Based Recommendations", "Compare Two Projects", "Analytics Dashboard"]
 )
 
 # Main title
@@ -46,22 +61,91 @@ if option == "Search by Question":
         - Combien de projets en web?
         """)
     
+    def fetch_results_page():
+        """Fetch the next page of the current search into session_state"""
+        payload = {"question": st.session_state.search_question}
+        if st.session_state.search_cursor:
+            payload["cursor"] = st.session_state.search_cursor
+        st.session_state.search_error = None
+        try:
+            response = client.post("/predict", payload)
+        except requests.exceptions.RequestException as e:
+            st.session_state.search_error = f"❌ Cannot connect to server: {e}"
+            return
+        if response.status_code == 200:
+            data = response.json()
+            st.session_state.search_pages.append(data.get("answer", "No results found"))
+            st.session_state.search_cursor = data.get("next_cursor")
+        elif response.status_code == 409:
+            st.session_state.search_cursor = None
+            st.session_state.search_error = "⚠️ The database changed since this search. Please search again."
+        else:
+            st.session_state.search_error = f"❌ Server error: {response.status_code}"
+    
     if search_btn:
         if not question:
             st.warning("⚠️ Please enter a question.")
         else:
+            # A new search starts again from the first page
+            st.session_state.search_question = question
+            st.session_state.search_pages = []
+            st.session_state.search_cursor = None
             with st.spinner("Searching database..."):
-                try:
-                    response = requests.post(f"{API_BASE_URL}/predict", json={"question": question})
-                    if response.status_code == 200:
-                        answer = response.json().get("answer", "No results found")
-                        st.success("✅ Search completed!")
-                        st.markdown("### 📋 Results:")
-                        st.markdown(answer)
-                    else:
+                fetch_results_page()
+            if st.session_state.search_pages:
+                st.success("✅ Search completed!")
+    
+    if st.session_state.get("search_pages"):
+        st.markdown("### 📋 Results:")
+        for page_answer in st.session_state.search_pages:
+            st.markdown(page_answer)
+        # Further pages are only fetched when asked for
+        if st.session_state.search_cursor:
+            st.button("⬇️ Load more results", on_click=fetch_results_page)
+    if st.session_state.get("search_error"):
+        st.error(st.session_state.search_error)
+
+# ---------------------------
+# Option 1b: Ask the AI Assistant (streamed Gemini answer)
+# ---------------------------
+elif option == "Ask the AI Assistant":
+    st.subheader("🤖 Ask the AI Assistant")
+    st.markdown("*Gemini answers using the PFE database - the answer appears as it is written*")
+    
+    ai_question = st.text_input(
+        "Your question:",
+        placeholder="Ex: Which projects combine networking and automation?"
+    )
+    ask_btn = st.button("✨ Ask", use_container_width=True)
+    
+    if ask_btn:
+        if not ai_question:
+            st.warning("⚠️ Please enter a question.")
+        else:
+            answer_box = st.empty()
+            answer = ""
+            try:
+                with client.stream("/ask/stream", {"question": ai_question}) as response:
+                    if response.status_code != 200:
                         st.error(f"❌ Server error: {response.status_code}")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"❌ Cannot connect to server: {e}")
+                    else:
+                        # Server-Sent Events: "event:" lines name the event, "data:" lines carry JSON
+                        event = "message"
+                        for line in response.iter_lines(decode_unicode=True):
+                            if line.startswith("event:"):
+                                event = line[len("event:"):].strip()
+                            elif line.startswith("data:"):
+                                payload = json.loads(line[len("data:"):])
+                                if event == "message":
+                                    answer += payload
+                                    answer_box.markdown(answer + " ▌")
+                                elif event == "error":
+                                    st.error(f"❌ {payload}")
+                            elif not line:
+                                event = "message"
+                        answer_box.markdown(answer)
+            except requests.exceptions.RequestException as e:
+                st.error(f"❌ Cannot connect to server: {e}")
 
 # ---------------------------
 # Option 2: Topic Suggestions
@@ -71,6 +155,12 @@ elif option == "Topic Suggestions":
     
     domains = ["Cybersecurity", "AI", "Blockchain", "Web", "Networking", "Mobile Networks", "Automation"]
     
+    # Fetch every domain at once (cached afterwards), so switching domains is instant
+    try:
+        client.gather(*(partial(client.recommend, d) for d in domains))
+    except (requests.exceptions.RequestException, APIError):
+        pass  # Reported below when the user asks for suggestions
+    
     col1, col2 = st.columns([2, 1])
     with col1:
         domaine = st.selectbox("Choose a domain:", domains)
@@ -82,18 +172,16 @@ elif option == "Topic Suggestions":
     if suggest_btn:
         with st.spinner(f"Generating suggestions for {domaine}..."):
             try:
-                response = requests.post(f"{API_BASE_URL}/recommend", json={"domain": domaine})
-                if response.status_code == 200:
-                    suggestions = response.json().get("suggestions", [])
-                    if suggestions:
-                        st.success(f"✅ Topics found for {domaine}")
-                        st.markdown(f"### 📚 Recommended Topics:")
-                        for i, s in enumerate(suggestions, 1):
-                            st.markdown(f"**{i}.** {s}")
-                    else:
-                        st.info("ℹ️ No topics found for this domain.")
+                suggestions = client.recommend(domaine).get("suggestions", [])
+                if suggestions:
+                    st.success(f"✅ Topics found for {domaine}")
+                    st.markdown(f"### 📚 Recommended Topics:")
+                    for i, s in enumerate(suggestions, 1):
+                        st.markdown(f"**{i}.** {s}")
                 else:
-                    st.error(f"❌ Server error: {response.status_code}")
+                    st.info("ℹ️ No topics found for this domain.")
+            except APIError as e:
+                st.error(f"❌ Server error: {e.status_code}")
             except requests.exceptions.RequestException as e:
                 st.error(f"❌ Cannot connect to server: {e}")
 
@@ -139,9 +227,9 @@ elif option == "Profile-Based Recommendations":
         else:
             with st.spinner("🔍 Analyzing your profile..."):
                 try:
-                    response = requests.post(
-                        f"{API_BASE_URL}/profile_recommend",
-                        json={
+                    response = client.post(
+                        "/profile_recommend",
+                        {
                             "skills": skills,
                             "certifications": certifications,
                             "interests": interests,
@@ -186,20 +274,26 @@ elif option == "Compare Two Projects":
     st.subheader("⚖️ Intelligent Project Comparison")
     st.markdown("Compare two PFE projects to help you make the best decision")
     
+    def pick_candidate(field, title):
+        """Put a suggested title in the matching input"""
+        st.session_state[f"compare_{field}"] = title
+    
     col1, col2 = st.columns(2)
     
     with col1:
         project1 = st.text_input(
             "🔵 First Project Title",
             placeholder="Ex: Wazuh as SIEM",
-            help="Enter keywords from the project title"
+            help="Enter keywords from the project title",
+            key="compare_project1"
         )
     
     with col2:
         project2 = st.text_input(
             "🟢 Second Project Title",
             placeholder="Ex: AI Agent",
-            help="Enter keywords from the project title"
+            help="Enter keywords from the project title",
+            key="compare_project2"
         )
     
     # Example comparisons
@@ -220,9 +314,9 @@ elif option == "Compare Two Projects":
         else:
             with st.spinner("🔍 Analyzing projects..."):
                 try:
-                    response = requests.post(
-                        f"{API_BASE_URL}/compare",
-                        json={"project1": project1, "project2": project2}
+                    response = client.post(
+                        "/compare",
+                        {"project1": project1, "project2": project2}
                     )
                     
                     if response.status_code == 200:
@@ -353,10 +447,21 @@ elif option == "Compare Two Projects":
                         )
                         st.plotly_chart(fig_comp, use_container_width=True)
                         
-                    elif response.status_code == 404:
-                        error_msg = response.json().get("error", "Project not found")
-                        st.error(f"❌ {error_msg}")
-                        st.info("💡 Tip: Try using fewer keywords or different terms from the project title")
+                    elif response.status_code in (404, 409):
+                        error = response.json()
+                        st.error(f"❌ {error.get('error', 'Project not found')}")
+                        candidates = error.get("candidates", [])
+                        if candidates:
+                            st.markdown("**Did you mean:**")
+                            for i, candidate in enumerate(candidates):
+                                st.button(
+                                    f"{candidate['title']} ({candidate['student']})",
+                                    key=f"pick_{error['field']}_{i}",
+                                    on_click=pick_candidate,
+                                    args=(error["field"], candidate["title"])
+                                )
+                        else:
+                            st.info("💡 Tip: Try using fewer keywords or different terms from the project title")
                     else:
                         st.error(f"❌ Server error: {response.status_code}")
                         
@@ -371,11 +476,11 @@ elif option == "Analytics Dashboard":
     st.subheader("📊 PFE Projects Analytics")
     
     try:
+        # Served from the client cache on reruns; revalidated with its ETag once the TTL runs out
         with st.spinner("Loading analytics..."):
-            response = requests.get(f"{API_BASE_URL}/stats")
-            
-        if response.status_code == 200:
-            stats = response.json()
+            stats = client.stats()
+        
+        if stats:
             
             # Top Metrics Row
             col1, col2, col3, col4 = st.columns(4)
@@ -505,8 +610,10 @@ elif option == "Analytics Dashboard":
                 st.dataframe(df_detail, use_container_width=True)
                 
         else:
-            st.error(f"❌ Server error: {response.status_code}")
+            st.info("ℹ️ No statistics available yet.")
             
+    except APIError as e:
+        st.error(f"❌ Server error: {e.status_code}")
     except requests.exceptions.RequestException as e:
         st.error(f"❌ Cannot connect to server: {e}")
 
@@ -0,0 +1,359 @@
+# src/gcrbot/benchmark.py
+"""Latency / throughput / memory benchmark of the API at growing dataset sizes.
+
+Each dataset size runs in a fresh interpreter that drives the Flask app
+in-process through its test client, so no server, network or Gemini key
+is needed. Examples:
+
+    pfe_benchmark                                   # 1k and 10k projects, a quick check
+    pfe_benchmark --full                            # 1k, 100k and 1M projects (slow)
+    pfe_benchmark --sizes 1000,100000 --iterations 50
+    pfe_benchmark --json bench.json                 # keep results to compare commits
+    pfe_benchmark --storage sqlite                  # same cases on the SQLite backend
+    pfe_benchmark --render 100000                   # result formatting only: rows/s
+"""
+import argparse
+import json
+import os
+import itertools
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from gcrbot import datagen
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = [1_000, 10_000]
+# --full: the sizes the README figures are measured at; building 1M projects takes minutes
+FULL_SIZES = [1_000, 100_000, 1_000_000]
+
+# Semantic vector width the service runs with, and the reduced one for datasets of LARGE_SIZE projects
+# and more, whose rows x dim x 4 bytes matrix would not fit in memory (2 GB at 1M x 512)
+SEMANTIC_DIM = int(os.getenv("PFE_SEMANTIC_DIM", "512"))
+LARGE_SIZE = 1_000_000
+LARGE_SEMANTIC_DIM = 128
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+# (name, JSON body) per endpoint; "{title}" / "{other}" are replaced by titles of the generated dataset
+CASES = [
+    ("predict_domain", "/predict", {"question": "projects in cybersecurity"}),
+    ("predict_keywords", "/predict", {"question": "network automation with ansible"}),
+    ("predict_semantic", "/predict", {"question": "detect intrusions in a company network", "mode": "semantic"}),
+    ("profile_recommend", "/profile_recommend",
+     {"skills": "python, machine learning", "certifications": "CCNA", "interests": "cloud security",
+      "level": "intermediate"}),
+    ("compare", "/compare", {"project1": "{title}", "project2": "{other}"}),
+    ("compare_fuzzy", "/compare", {"project1": "{title_typo}", "project2": "{other}"}),
+    ("similar", "/similar", {"project": "{title}"}),
+    ("stats", "/stats", None),
+]
+
+# Questions sent to search_pfe(), the retrieval behind the Gemini tool
+SEARCH_QUERIES = ["intelligence artificielle", "sécurité réseau", "web platform angular", "iot monitoring"]
+
+
+def dataset(data_dir, rows, seed):
+    """Path of the generated dataset for (rows, seed), written on first use"""
+    path = Path(data_dir) / f"pfe_{rows}_{seed}.csv"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        datagen.write_csv(path, rows, seed)
+    return path
+
+
+# ---------------------------
+# Measurements (run inside the worker interpreter)
+# ---------------------------
+def _peak_rss_mb():
+    """Peak resident memory of this process so far, None where it cannot be read"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    # Windows reports the peak working set
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def _round(value, digits):
+    return round(value, digits) if value is not None else None
+
+
+def summarize(latencies, elapsed):
+    """Percentiles in ms and requests per second of one timed loop"""
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {
+        "iterations": len(ordered),
+        "p50_ms": round(percentile(50), 3),
+        "p90_ms": round(percentile(90), 3),
+        "p99_ms": round(percentile(99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": _round(_peak_rss_mb(), 1),
+    }
+
+
+def timed(call, iterations, warmup):
+    """Run call warmup + iterations times and summarize the timed runs"""
+    for _ in range(warmup):
+        call()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def _fill(payload, titles):
+    if payload is None:
+        return None
+    return {key: value.format(**titles) if isinstance(value, str) else value for key, value in payload.items()}
+
+
+def run_worker(iterations, warmup):
+    """Benchmark the dataset PFE_CSV_PATH points to; returns the result dict"""
+    start = time.perf_counter()
+    from gcrbot import api
+    from gcrbot.tools import db_tool
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if db_tool.dataset_version() is None:
+        raise RuntimeError(f"Could not load {db_tool.CSV_PATH}")
+    load_s = time.perf_counter() - start
+    load_rss = _peak_rss_mb()
+
+    rows = db_tool.project_count()
+    title, other = db_tool.list_projects(0, 1)['title'].iloc[0], db_tool.list_projects(rows // 2, 1)['title'].iloc[0]
+    titles = {"title": title, "other": other, "title_typo": title[:-3] + title[-2:] + title[-3]}
+
+    client = api.app.test_client()
+    endpoints = {}
+    for name, path, payload in CASES:
+        if payload and payload.get("mode", "keyword") not in db_tool.SEARCH_MODES:
+            continue  # Semantic search is not offered by the sqlite backend
+        body = _fill(payload, titles)
+        if body is None:
+            call = lambda path=path: client.get(path)
+        else:
+            call = lambda path=path, body=body: client.post(path, json=body)
+        status = call().status_code
+        # A typo'd title may legitimately be ambiguous; 409 still runs the whole resolution
+        if status != 200 and not (name == "compare_fuzzy" and status == 409):
+            raise RuntimeError(f"{name}: {path} answered {status}")
+        endpoints[name] = timed(call, iterations, warmup)
+
+    # "stats" above serves the payload cached for the dataset version; a new version per request recomputes it
+    snapshot = db_tool.get_snapshot()
+    version, bumps = snapshot.version, itertools.count()
+
+    def stats_cold():
+        snapshot.version = f"{version}-{next(bumps)}"
+        return client.get("/stats")
+
+    endpoints["stats_cold"] = timed(stats_cold, iterations, warmup)
+    snapshot.version = version
+
+    queries = iter(SEARCH_QUERIES * (iterations + warmup))
+    endpoints["search_pfe"] = timed(lambda: db_tool.search_pfe(next(queries)), iterations, warmup)
+
+    return {
+        "rows": rows,
+        "storage": db_tool.STORAGE,
+        "import_s": round(import_s, 3),
+        "load_s": round(load_s, 3),
+        "load_peak_rss_mb": _round(load_rss, 1),
+        "peak_rss_mb": _round(_peak_rss_mb(), 1),
+        "endpoints": endpoints,
+    }
+
+
+# ---------------------------
+# Result formatting (rows per second)
+# ---------------------------
+def _iterrows_blocks(projects):
+    """/predict Markdown as it was built before tools/render.py, one boxed row at a time (baseline)"""
+    results = []
+    for idx, (_, row) in enumerate(projects.iterrows(), 1):
+        results.append(f"{idx}. **Student:** {row['student']}")
+        results.append(f"   **Title:** {row['title']}")
+        results.append(f"   **Specialty:** {row['specialty']}")
+        results.append(f"   **Year:** {row['year']}\n")
+    return "\n".join(results)
+
+
+def _iterrows_records(projects):
+    """JSON records built row by row with iterrows (baseline)"""
+    import pandas as pd
+    records = []
+    for _, row in projects.iterrows():
+        record = {col: str(row[col]) if pd.notna(row[col]) else None
+                  for col in ["student", "title", "specialty", "supervisor"]}
+        record["year"] = int(row["year"]) if pd.notna(row["year"]) else None
+        records.append(record)
+    return records
+
+
+def _rows_per_second(fn, rows, repeat):
+    """rows / fastest of `repeat` calls of fn"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(rows / best) if best else None
+
+
+def run_render(rows, seed, repeat=3):
+    """Rows formatted per second, before (iterrows, json) and after (tools.render, orjson)"""
+    import pandas as pd
+    from gcrbot.tools import render
+    projects = pd.DataFrame(datagen.generate_rows(rows, seed), columns=datagen.COLUMNS)
+
+    markdown = "\n".join(render.project_blocks(projects))
+    records = render.records(projects)
+    if markdown != _iterrows_blocks(projects) or records != _iterrows_records(projects):
+        raise RuntimeError("tools.render output differs from the iterrows baseline")
+
+    result = {
+        "rows": rows,
+        "markdown_iterrows": _rows_per_second(lambda: _iterrows_blocks(projects), rows, repeat),
+        "markdown_bulk": _rows_per_second(lambda: "\n".join(render.project_blocks(projects)), rows, repeat),
+        "records_iterrows": _rows_per_second(lambda: _iterrows_records(projects), rows, repeat),
+        "records_bulk": _rows_per_second(lambda: render.records(projects), rows, repeat),
+        "json_stdlib": _rows_per_second(lambda: json.dumps(records).encode("utf-8"), rows, repeat),
+    }
+    try:
+        import orjson
+    except ImportError:
+        result["json_orjson"] = None
+    else:
+        result["json_orjson"] = _rows_per_second(lambda: orjson.dumps(records), rows, repeat)
+    return result
+
+
+def print_render(result):
+    print(f"Formatting {result['rows']:,} projects (rows/s, best of 3):")
+    for before, after, label in (("markdown_iterrows", "markdown_bulk", "Markdown blocks"),
+                                 ("records_iterrows", "records_bulk", "JSON records"),
+                                 ("json_stdlib", "json_orjson", "JSON encoding")):
+        if result[after] is None:
+            print(f"  {label:<16} {result[before]:>12,} -> (orjson not installed)")
+            continue
+        print(f"  {label:<16} {result[before]:>12,} -> {result[after]:>12,}  x{result[after] / result[before]:.1f}")
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+def run_size(path, iterations, warmup, semantic_dim, storage="memory"):
+    """Benchmark one dataset in a fresh interpreter (clean memory peak, own CSV_PATH)"""
+    if storage == "sqlite":
+        for old in path.parent.glob(f"{path.stem}.*.sqlite"):
+            old.unlink()  # Measure the full import
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env.update({
+        "PFE_CSV_PATH": str(path),
+        "PFE_RELOAD_INTERVAL": "0",
+        "PFE_SNAPSHOT": "0",  # Measure the full build, and leave no .snapshot next to the data
+        "PFE_SEMANTIC_DIM": str(semantic_dim),
+        "PFE_STORAGE": storage,
+        "PFE_SQLITE_PATH": str(path.with_suffix(".sqlite")),
+    })
+    code = f"import json, gcrbot.benchmark as b; print(json.dumps(b.run_worker({iterations}, {warmup})))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{path.name} failed:\n{proc.stderr.strip()}")
+    return dict(json.loads(proc.stdout.strip().splitlines()[-1]), semantic_dim=semantic_dim)
+
+
+def print_result(result):
+    peak = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "n/a"
+    print(f"{result['rows']:,} projects ({result['storage']}): load {result['load_s']:.2f} s, peak {peak}")
+    if result["semantic_dim"] != SEMANTIC_DIM:
+        print(f"  semantic vectors of {result['semantic_dim']} dimensions, not the service's {SEMANTIC_DIM}")
+    print(f"  {'endpoint':<18} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+    for name, m in result["endpoints"].items():
+        print(f"  {name:<18} {m['p50_ms']:9.2f} {m['p90_ms']:9.2f} {m['p99_ms']:9.2f} {m['throughput_rps']:9.1f}")
+
+
+def _sizes(text):
+    return [int(size.replace("_", "")) for size in text.split(",") if size.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the gcrbot API on generated datasets")
+    parser.add_argument("--sizes", type=_sizes, default=DEFAULT_SIZES,
+                        help="comma-separated project counts (default: 1000,10000)")
+    parser.add_argument("--full", action="store_const", dest="sizes", const=FULL_SIZES,
+                        help="benchmark 1k, 100k and 1M projects")
+    parser.add_argument("--iterations", type=int, default=100, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per endpoint")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the generated datasets")
+    parser.add_argument("--semantic-dim", type=int,
+                        help=f"PFE_SEMANTIC_DIM for every size (default: {SEMANTIC_DIM}, "
+                             f"{LARGE_SEMANTIC_DIM} from {LARGE_SIZE:,} projects on)")
+    parser.add_argument("--storage", choices=["memory", "sqlite"], default="memory",
+                        help="PFE_STORAGE backend to benchmark")
+    parser.add_argument("--data-dir", default=Path.home() / ".cache" / "gcrbot-bench",
+                        help="where generated datasets are kept between runs")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    parser.add_argument("--render", type=int, metavar="ROWS",
+                        help="only benchmark result formatting on ROWS generated projects")
+    args = parser.parse_args(argv)
+
+    if args.render is not None:
+        result = run_render(args.render, args.seed)
+        print_render(result)
+        if args.json:
+            Path(args.json).write_text(json.dumps({"render": result}, indent=2), encoding="utf-8")
+        return 0
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": {"iterations": args.iterations, "warmup": args.warmup, "seed": args.seed,
+                     # None: SEMANTIC_DIM, reduced from LARGE_SIZE; every result records its own
+                     "semantic_dim": args.semantic_dim, "service_semantic_dim": SEMANTIC_DIM,
+                     "storage": args.storage},
+        "results": [],
+    }
+    failed = False
+    for size in args.sizes:
+        path = dataset(args.data_dir, size, args.seed)
+        try:
+            semantic_dim = args.semantic_dim or (LARGE_SEMANTIC_DIM if size >= LARGE_SIZE else SEMANTIC_DIM)
+            result = run_size(path, args.iterations, args.warmup, semantic_dim, args.storage)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}")
+            failed = True
+            continue
+        report["results"].append(result)
+        print_result(result)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
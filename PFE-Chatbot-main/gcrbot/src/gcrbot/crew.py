@@ -1,13 +1,15 @@
 # src/gcrbot/crew.py
 import os
-from dotenv import load_dotenv
-from crewai import Crew, Agent, LLM, Task
-from gcrbot.tools.db_tool import PFESearchTool
-
-load_dotenv()
 
+# crewai, le .env et la base PFE ne sont chargés qu'à la création du crew,
+# pas à l'import du module
 class InfoScolaireCrew:
     def __init__(self):
+        from dotenv import load_dotenv
+        load_dotenv()  # avant db_tool, qui lit les réglages PFE_* à l'import
+        from crewai import Crew, LLM
+        from gcrbot.tools.db_tool import PFESearchTool
+
         self.tool = PFESearchTool()
 
         # Force Google AI Studio (pas Vertex AI)
@@ -18,7 +20,18 @@ class InfoScolaireCrew:
             api_base="https://generativelanguage.googleapis.com/v1beta"  # ← Clé !
         )
 
+        # Agent, tâche et crew construits une seule fois : seule la question change à chaque tour
+        self.agent = self.info_agent()
+        self.task = self.answer_question_task()
+        self.crew = Crew(
+            agents=[self.agent],
+            tasks=[self.task],
+            llm=self.llm,
+            verbose=True
+        )
+
     def info_agent(self):
+        from crewai import Agent
         return Agent(
             role="Analyste de Projets de Fin d'Études",
             goal="Répondre précisément aux questions sur les PFE en utilisant la base CSV",
@@ -32,13 +45,18 @@ class InfoScolaireCrew:
             allow_delegation=False
         )
 
-    def answer_question_task(self, question: str):
+    def answer_question_task(self):
+        from crewai import Task
+        # {question} est remplacé par kickoff(inputs=...) à chaque question
         return Task(
-            description=f"Réponds à cette question en utilisant l'outil si nécessaire :\n{question}",
+            description="Réponds à cette question en utilisant l'outil si nécessaire :\n{question}",
             expected_output="Réponse claire, concise et en français. Utilise des puces si plusieurs éléments.",
-            agent=self.info_agent()
+            agent=self.agent
         )
 
+    def ask(self, question: str):
+        return self.crew.kickoff(inputs={"question": question})
+
     def run_chat(self):
         print("Chatbot InfoScolaire PFE (tape 'quit' pour quitter)")
         while True:
@@ -47,15 +65,8 @@ class InfoScolaireCrew:
                 print("Au revoir !")
                 break
             if q:
-                task = self.answer_question_task(q)
-                crew = Crew(
-                    agents=[self.info_agent()],
-                    tasks=[task],
-                    llm=self.llm,
-                    verbose=True
-                )
                 try:
-                    result = crew.kickoff()
+                    result = self.ask(q)
                     print(f"\nAssistant : {result}")
                 except Exception as e:
                     print(f"Erreur : {e}")
@@ -0,0 +1,226 @@
+# src/gcrbot/datagen.py
+"""Synthetic pfe_projects.csv catalogues for scale testing.
+
+Rows use the real schema (student,title,specialty,supervisor,year). Titles
+are FR/EN and are built from the taxonomy keywords, so the search, stats
+and profile features find the same kind of matches as on real data.
+Domains, specialties and years are skewed like a real department.
+Output is streamed, so any size fits in constant memory, and a seed
+always gives the same file. Examples:
+
+    pfe_generate 100000 -o knowledge/pfe_100k.csv
+    pfe_generate 5000000 --seed 7 -o big.csv
+    pfe_generate 20 | head
+"""
+import argparse
+import csv
+import random
+import sys
+from itertools import accumulate, islice
+from pathlib import Path
+
+from gcrbot.tools import taxonomy
+
+COLUMNS = ["student", "title", "specialty", "supervisor", "year"]
+
+# Share of projects per domain (the fixture is mostly networking, security and AI)
+DOMAIN_WEIGHTS = {
+    "network": 20, "cybersecurity": 16, "ai": 15, "web": 13, "cloud": 10, "automation": 8,
+    "mobile": 6, "iot": 5, "quality": 4, "blockchain": 2, "computer vision": 1,
+}
+
+# Specialties per domain, most common first
+SPECIALTIES = {
+    "ai": ["Machine Learning", "Generative AI", "AI & Productivity", "AI & HR", "Computer Science"],
+    "cybersecurity": ["Cybersecurity", "Network Security", "IaaC & Security"],
+    "network": ["Networking", "IaaC & Networking", "SDN Networks", "QoS & Networking", "Network Testing"],
+    "web": ["Web Development", "Software Development", "Web Automation", "Computer Science"],
+    "cloud": ["IaaC & Networking", "Orchestration", "IaaC & Security"],
+    "automation": ["Automation", "Web Automation"],
+    "mobile": ["Telecommunications", "Mobile Networks", "Mobile Application"],
+    "iot": ["Embedded Systems", "IoT & Blockchain"],
+    "quality": ["Software Quality", "QoS", "Network Testing"],
+    "blockchain": ["Blockchain", "FinTech", "IoT & Blockchain"],
+    "computer vision": ["AI & Computer Vision", "Image Processing"],
+}
+SPECIALTY_SKEW = 1.2  # Zipf exponent inside a domain's specialty list
+
+# Later years have more projects: weight of year i is YEAR_GROWTH ** i
+YEAR_GROWTH = 1.25
+FIRST_YEAR, LAST_YEAR = 2015, 2025
+
+FRENCH_SHARE = 0.35  # Titles written in French
+SECOND_DOMAIN_SHARE = 0.25  # Titles combining two domains
+SUPERVISOR_SHARE = 0.3  # Rows with a named supervisor (others say "Not specified")
+
+# Keywords that read badly as a title subject (adjectives, verbs, too generic)
+SKIP_KEYWORDS = {"intelligent", "automate", "automated", "automating", "platform", "plateforme", "website",
+                 "site web", "cyber", "cyber-security", "cyber-sécurité", "cyber security", "networks",
+                 "test", "testing", "ia", "ml", "cv", "mobile networks", "process optimization"}
+# English words kept out of French titles (French ones are recognised by their accents or FRENCH_KEYWORDS)
+ENGLISH_WORDS = {"network", "networking", "security", "quality", "automation", "routing", "sensor", "embedded",
+                 "gesture", "orchestration", "orchestrator", "telecommunications", "telecom", "web", "mobile",
+                 "cybersecurity", "crypto", "soc"}
+FRENCH_KEYWORDS = {"intelligence artificielle", "apprentissage automatique", "internet des objets", "automatisation"}
+# How keywords are written in titles when plain capitalisation is wrong
+SPELLINGS = {kw: kw.upper() for kw in ["ai", "siem", "soar", "soc", "xdr", "sdn", "sd-wan", "4g", "5g", "oci", "aws",
+                                       "gcp", "qa", "ocr", "dlc", "html", "eigrp", "ospf", "ftto", "ftta", "iota"]}
+SPELLINGS.update({"iot": "IoT", "iaac": "IaaC", "qos": "QoS", "devops": "DevOps", "generative ai": "Generative AI"})
+
+EN_ACTIONS = ["Design and Implementation", "Development", "Implementation", "Deployment", "Automation",
+              "Optimization", "Evaluation", "Integration", "Modernization", "Monitoring"]
+EN_OBJECTS = ["Platform", "Solution", "Architecture", "Management System", "Dashboard", "Application",
+              "Framework", "Infrastructure", "Pipeline", "Assistant"]
+EN_CONTEXTS = ["for an Internet Service Provider", "for Human Resources", "in a Hybrid Cloud",
+               "for a Telecom Operator", "for Banking Services", "for Smart Agriculture", "for a University Campus",
+               "in an Industrial Environment", "for Healthcare", "for SMEs", "", ""]
+FR_ACTIONS = ["Conception et réalisation", "Développement", "Mise en place", "Déploiement", "Automatisation",
+              "Optimisation", "Étude et mise en œuvre", "Intégration", "Supervision"]
+FR_OBJECTS = ["d'une plateforme", "d'une solution", "d'une architecture", "d'un système de gestion",
+              "d'un tableau de bord", "d'une application", "d'une infrastructure", "d'un assistant"]
+FR_CONTEXTS = ["pour un opérateur télécom", "pour les ressources humaines", "dans un cloud hybride",
+               "pour le secteur bancaire", "pour l'agriculture intelligente", "pour un campus universitaire",
+               "en milieu industriel", "pour la santé", "pour les PME", "", ""]
+
+LAST_NAMES = ["BEN ALI", "TRABELSI", "GHARBI", "HAMMAMI", "BOUAZIZI", "JLASSI", "MEJRI", "SASSI", "KHELIFI",
+              "BEN SALAH", "DRIDI", "AYARI", "MANSOURI", "ZOUARI", "CHAABANE", "BRAHMI", "HAMDI", "RIAHI",
+              "KARDI", "DHAHRI", "HACHAICHI", "BOUZAKHER", "MARZOUGUI", "BACCAR", "FERCHICHI", "OUESLATI",
+              "NASRI", "SAIDI", "TLILI", "BEN AMOR"]
+FIRST_NAMES = ["MOHAMED", "AHMED", "YOUSSEF", "AMINE", "SAMI", "KARIM", "OMAR", "JASSER", "HAMZA", "ALI",
+               "RANIA", "AICHA", "FERDAOUS", "SARRA", "MARIEM", "INES", "NOUR", "YASMINE", "EYA", "OLFA",
+               "LINA", "SALMA", "WALID", "HOUSSEM", "AMIRA", "SONIA", "FARES", "NADIA", "MALEK", "SIWAR"]
+SUPERVISOR_TITLES = ["Dr.", "Mr.", "Mrs.", "Pr."]
+
+# Rows drawn per batch (one rng.choices() call per column)
+BATCH_ROWS = 10_000
+
+
+def _is_french(keyword):
+    return keyword in FRENCH_KEYWORDS or not keyword.isascii()
+
+
+def _subjects():
+    """{"en": {domain: keywords}, "fr": {...}}: usable title keywords, written as in a title of that language"""
+    subjects = {"en": {}, "fr": {}}
+    for domain in DOMAIN_WEIGHTS:
+        words = [kw for kw in taxonomy.DOMAINS[domain]["keywords"] if kw not in SKIP_KEYWORDS]
+        english = [kw for kw in words if not _is_french(kw)]
+        # French titles keep French terms, acronyms and product names (Docker, Angular...)
+        french = [kw for kw in words if _is_french(kw) or (" " not in kw and kw not in ENGLISH_WORDS)]
+        subjects["en"][domain] = [SPELLINGS.get(kw, kw.title()) for kw in english]
+        subjects["fr"][domain] = [SPELLINGS.get(kw, kw if _is_french(kw) else kw.capitalize())
+                                  for kw in french] or subjects["en"][domain]
+    return subjects
+
+
+def _zipf(count, skew):
+    return [1 / (rank + 1) ** skew for rank in range(count)]
+
+
+def _title(rng, subjects, domain, other):
+    if rng.random() < FRENCH_SHARE:
+        words = subjects["fr"]
+        subject = rng.choice(words[domain])
+        if rng.random() < 0.5:
+            link = f"intégrant {subject}"
+        elif subject[0].lower() in "aeiouéh":
+            link = f"à base d'{subject}"
+        else:
+            link = f"à base de {subject}"
+        parts = [rng.choice(FR_ACTIONS), rng.choice(FR_OBJECTS), link]
+        if other:
+            parts += ["et", rng.choice(words[other])]
+        parts.append(rng.choice(FR_CONTEXTS))
+    else:
+        words = subjects["en"]
+        subject = rng.choice(words[domain])
+        parts = [rng.choice(EN_ACTIONS), "of an" if subject[0] in "AEIOU" else "of a", subject,
+                 rng.choice(EN_OBJECTS)]
+        if other:
+            parts += ["with", rng.choice(words[other])]
+        parts.append(rng.choice(EN_CONTEXTS))
+    return " ".join(part for part in parts if part)
+
+
+def _person(rng):
+    last, first = rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES)
+    if rng.random() < 0.2:
+        return f"{last} {first} {rng.choice(FIRST_NAMES)}"
+    return f"{last} {first}"
+
+
+def generate_rows(count, seed=42, first_year=FIRST_YEAR, last_year=LAST_YEAR):
+    """Yield `count` rows [student, title, specialty, supervisor, year], deterministic for a seed"""
+    rng = random.Random(seed)
+    subjects = _subjects()
+    domains = list(DOMAIN_WEIGHTS)
+    domain_cum = list(accumulate(DOMAIN_WEIGHTS.values()))
+    specialty_cum = {d: list(accumulate(_zipf(len(SPECIALTIES[d]), SPECIALTY_SKEW))) for d in domains}
+    years = list(range(first_year, last_year + 1))
+    year_cum = list(accumulate(YEAR_GROWTH ** i for i in range(len(years))))
+
+    remaining = count
+    while remaining > 0:
+        batch = min(BATCH_ROWS, remaining)
+        remaining -= batch
+        batch_domains = rng.choices(domains, cum_weights=domain_cum, k=batch)
+        batch_years = rng.choices(years, cum_weights=year_cum, k=batch)
+        for domain, year in zip(batch_domains, batch_years):
+            other = None
+            if rng.random() < SECOND_DOMAIN_SHARE:
+                other = rng.choices(domains, cum_weights=domain_cum)[0]
+                if other == domain:
+                    other = None
+            specialty = rng.choices(SPECIALTIES[domain], cum_weights=specialty_cum[domain])[0]
+            supervisor = "Not specified"
+            if rng.random() < SUPERVISOR_SHARE:
+                supervisor = f"{rng.choice(SUPERVISOR_TITLES)} {_person(rng).title()}"
+            yield [_person(rng), _title(rng, subjects, domain, other), specialty, supervisor, year]
+
+
+def write_csv(out, count, seed=42, **options):
+    """Stream `count` generated rows to a path (written atomically) or an open text file"""
+    if not isinstance(out, (str, Path)):
+        _write_rows(out, count, seed, options)
+        return
+    path = Path(out)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        _write_rows(f, count, seed, options)
+    tmp.replace(path)
+
+
+def _write_rows(f, count, seed, options):
+    writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerow(COLUMNS)
+    rows = generate_rows(count, seed, **options)
+    while True:
+        batch = list(islice(rows, BATCH_ROWS))
+        if not batch:
+            break
+        writer.writerows(batch)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic pfe_projects.csv for scale testing")
+    parser.add_argument("rows", type=lambda s: int(s.replace("_", "")), help="number of projects")
+    parser.add_argument("-o", "--output", help="CSV path (default: stdout)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (same seed, same file)")
+    parser.add_argument("--first-year", type=int, default=FIRST_YEAR)
+    parser.add_argument("--last-year", type=int, default=LAST_YEAR)
+    args = parser.parse_args(argv)
+    if args.rows < 0 or args.first_year > args.last_year:
+        parser.error("rows must be >= 0 and --first-year <= --last-year")
+
+    options = {"first_year": args.first_year, "last_year": args.last_year}
+    try:
+        write_csv(args.output or sys.stdout, args.rows, args.seed, **options)
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
+    if args.output:
+        print(f"Wrote {args.rows:,} projects to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,40 +4,181 @@ os.environ["GRPC_VERBOSITY"] = "NONE"
 os.environ["GRPC_LOG_LEVEL"] = "ERROR"
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
-import google.generativeai as genai
-from dotenv import load_dotenv
-from gcrbot.tools.db_tool import search_pfe
 import logging
+import threading
+from pathlib import Path
+from gcrbot import metrics
+from gcrbot.answer_cache import AnswerCache, make_key
+from gcrbot.llm_gate import LLMGate
 
-# Cache les warnings Google
-logging.getLogger("google.generativeai").setLevel(logging.ERROR)
+# Le SDK Gemini, le .env, le modèle, le cache et la file d'appels ne sont créés
+# qu'au premier usage : importer ce module (ou lancer la CLI) reste instantané.
 
-# Charge la clé API
-load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-
-# Modèle Gemini 2.5 Flash
-model = genai.GenerativeModel(
-    "gemini-2.5-flash",
-    system_instruction="""
+MODEL_NAME = "gemini-2.5-flash"
+SYSTEM_INSTRUCTION = """
     You are an expert assistant for analyzing End-of-Studies Projects (PFE).
     You use the provided data to answer factually.
     Always respond in English, using bullet points if multiple items.
     Be clear, concise, and professional.
     """
-)
 
-def ask_gemini(question: str) -> str:
-    data = search_pfe(question)
-    prompt = f"""
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "answer_cache.sqlite"
+
+_lock = threading.Lock()
+_instances = {}
+
+def _load_env():
+    # Charge la clé API et les réglages PFE_* (une seule fois)
+    if "env" not in _instances:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _instances["env"] = True
+
+def _create_model():
+    import google.generativeai as genai
+    # Cache les warnings Google
+    logging.getLogger("google.generativeai").setLevel(logging.ERROR)
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    # Modèle Gemini 2.5 Flash
+    return genai.GenerativeModel(MODEL_NAME, system_instruction=SYSTEM_INSTRUCTION)
+
+def _create_answer_cache():
+    # Cache des réponses : LRU en mémoire + SQLite sur disque (PFE_ANSWER_CACHE=off pour désactiver le disque)
+    cache_path = os.getenv("PFE_ANSWER_CACHE", str(DEFAULT_CACHE_PATH))
+    return AnswerCache(
+        path=None if cache_path == "off" else cache_path,
+        ttl=float(os.getenv("PFE_ANSWER_CACHE_TTL", "86400")),
+        memory_size=int(os.getenv("PFE_ANSWER_CACHE_MEMORY_SIZE", "256")),
+        disk_size=int(os.getenv("PFE_ANSWER_CACHE_DISK_SIZE", "10000")),
+    )
+
+def _create_llm_gate():
+    # Appels sortants : questions identiques en vol partagées, concurrence bornée avec file d'attente
+    return LLMGate(
+        max_concurrent=int(os.getenv("PFE_LLM_MAX_CONCURRENT", "4")),
+        max_waiting=int(os.getenv("PFE_LLM_MAX_WAITING", "32")),
+        timeout=float(os.getenv("PFE_LLM_WAIT_TIMEOUT", "30")),
+    )
+
+_FACTORIES = {"model": _create_model, "answer_cache": _create_answer_cache, "llm_gate": _create_llm_gate}
+
+def _get(name):
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                _load_env()
+                instance = _instances[name] = _FACTORIES[name]()
+    return instance
+
+def get_model():
+    return _get("model")
+
+def get_answer_cache():
+    return _get("answer_cache")
+
+def get_llm_gate():
+    return _get("llm_gate")
+
+def __getattr__(name):
+    # gemini_tool.model / .answer_cache / .llm_gate restent accessibles comme avant
+    if name in _FACTORIES:
+        return _get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@metrics.register_collector
+def _cache_metrics():
+    # Lu au moment du scrape ; rien n'est créé si le cache ou la file n'ont pas encore servi
+    families = []
+    cache = _instances.get("answer_cache")
+    if cache is not None:
+        stats = cache.stats()
+        families += [
+            ("pfe_answer_cache_hits_total", "counter", "Gemini answers served from the cache",
+             [({"tier": "memory"}, stats["memory_hits"]), ({"tier": "disk"}, stats["disk_hits"])]),
+            ("pfe_answer_cache_misses_total", "counter", "Questions that needed a Gemini call",
+             [({}, stats["misses"])]),
+            ("pfe_answer_cache_hit_ratio", "gauge", "Share of questions answered from the cache",
+             [({}, stats["hit_ratio"])]),
+            ("pfe_answer_cache_entries", "gauge", "Cached answers per tier",
+             [({"tier": "memory"}, stats["memory_entries"]), ({"tier": "disk"}, stats["disk_entries"])]),
+        ]
+    gate = _instances.get("llm_gate")
+    if gate is not None:
+        families += [
+            ("pfe_llm_waiting", "gauge", "Calls queued for a Gemini slot", [({}, gate.limiter.waiting)]),
+            ("pfe_llm_rejected_total", "counter", "Calls refused because the queue was full or timed out",
+             [({}, gate.limiter.rejected)]),
+        ]
+    return families
+
+def _search(question):
+    _load_env()
+    from gcrbot.tools.db_tool import search_pfe
+    return search_pfe(question)
+
+def build_prompt(question: str, data: str) -> str:
+    return f"""
     User question: {question}
     Available data:
     {data}
 
     Answer in English, in a structured and professional way.
     """
+
+def ask_gemini(question: str) -> str:
+    data = _search(question)
+    key = make_key(question, data, MODEL_NAME)
+    answer_cache = get_answer_cache()
+    cached = answer_cache.get(key)
+    if cached is not None:
+        return cached
+
+    prompt = build_prompt(question, data)
+
+    def generate():
+        with metrics.stage("generate_content"):
+            text = get_model().generate_content(prompt).text
+        # An empty answer is not cached, so the next call tries the model again
+        if text:
+            answer_cache.set(key, text)
+        return text
+
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return get_llm_gate().run(key, generate)
     except Exception as e:
-        return f"Error: {e}"
\ No newline at end of file
+        return f"Error: {e}"
+
+def stream_gemini(question: str):
+    """Yield the answer piece by piece as Gemini generates it.
+
+    Cached answers are yielded in one piece; a fully streamed, non-empty
+    answer is cached like one from ask_gemini(). A stream started while the
+    same question is already being generated joins that call instead of
+    asking the model again. Streams hold a concurrency slot until they
+    finish. Errors are raised to the caller.
+    """
+    data = _search(question)
+    key = make_key(question, data, MODEL_NAME)
+    answer_cache = get_answer_cache()
+    cached = answer_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    prompt = build_prompt(question, data)
+
+    def generate():
+        parts = []
+        with metrics.stage("generate_content_stream"):
+            for chunk in get_model().generate_content(prompt, stream=True):
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+        answer = "".join(parts)
+        if answer:
+            answer_cache.set(key, answer)
+
+    yield from get_llm_gate().stream(key, generate)
@@ -0,0 +1,105 @@
+# src/gcrbot/importtime.py
+"""Import-time report for the gcrbot entry points.
+
+Each module is imported in a fresh interpreter with `python -X importtime`
+so the numbers match a cold CLI start. Examples:
+
+    pfe_importtime                          # table for every entry point
+    pfe_importtime gcrbot.main --top 10
+    pfe_importtime --json report.json --max-ms 300   # CI: fail above 300 ms
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ENTRY_POINTS = ["gcrbot.main", "gcrbot.crew", "gcrbot.gemini_tool", "gcrbot.tools.db_tool", "gcrbot.api"]
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+
+def _trace(code):
+    """stderr of `python -X importtime -c code` with src/ on the path"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{code} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    return proc.stderr
+
+
+def measure(module, startup=frozenset()):
+    """Import module in a new interpreter and parse its -X importtime trace.
+
+    Returns {"module", "total_ms", "imports": [{"name", "self_ms", "cumulative_ms", "depth"}]}
+    with imports in the order they finished loading. Modules named in
+    startup (loaded by the bare interpreter) are left out.
+    """
+    stderr = _trace(f"import {module}")
+
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if name.strip() in startup:
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append({
+            "name": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": depth,
+        })
+    total = next((i["cumulative_ms"] for i in reversed(imports) if i["name"] == module), 0.0)
+    return {"module": module, "total_ms": total, "imports": imports}
+
+
+def startup_modules():
+    """Modules the interpreter imports before running any code (site, .pth hooks...)"""
+    return frozenset(line.split("|", 2)[2].strip() for line in _trace("pass").splitlines()
+                     if line.startswith("import time:") and "[us]" not in line)
+
+
+def print_report(report, top):
+    print(f"{report['module']}: {report['total_ms']:.1f} ms")
+    heaviest = sorted((i for i in report["imports"] if i["depth"] <= 1 and i["name"] != report["module"]),
+                      key=lambda i: i["cumulative_ms"], reverse=True)[:top]
+    for item in heaviest:
+        print(f"  {item['cumulative_ms']:9.1f} ms  {item['name']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import (startup) cost of gcrbot modules")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="modules to import (default: entry points)")
+    parser.add_argument("--top", type=int, default=5, help="heaviest direct imports to list per module")
+    parser.add_argument("--json", metavar="PATH", help="also write the full report as JSON")
+    parser.add_argument("--max-ms", type=float, help="exit with status 1 if a module takes longer to import")
+    args = parser.parse_args(argv)
+
+    reports = []
+    failed = False
+    startup = startup_modules()
+    for module in args.modules:
+        try:
+            report = measure(module, startup)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}")
+            failed = True
+            continue
+        reports.append(report)
+        print_report(report, args.top)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, indent=2), encoding="utf-8")
+
+    over = [r["module"] for r in reports if args.max_ms is not None and r["total_ms"] > args.max_ms]
+    if over:
+        print(f"[ERROR] Over the {args.max_ms:g} ms budget: {', '.join(over)}")
+    return 1 if failed or over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
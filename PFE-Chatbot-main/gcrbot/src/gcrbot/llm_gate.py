@@ -0,0 +1,169 @@
+# src/gcrbot/llm_gate.py
+import threading
+from contextlib import closing, contextmanager
+
+
+class GateFullError(RuntimeError):
+    """Raised when no slot frees up: the wait queue is full or the wait timed out"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.changed = threading.Condition()
+        self.parts = []
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Callers asking for the same key while a call is running share its result.
+
+    do() shares a return value; stream() shares the pieces of a text stream,
+    replaying those already produced to callers that join late. Both kinds
+    can join each other: the result of a stream is its pieces joined.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def _join(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        return call, leader
+
+    def _finish(self, key, call):
+        with self._lock:
+            del self._calls[key]
+        with call.changed:
+            call.done.set()
+            call.changed.notify_all()
+
+    def do(self, key, fn):
+        call, leader = self._join(key)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+        return call.result
+
+    def stream(self, key, fn):
+        """Yield the pieces of fn(), a generator of strings, shared with concurrent callers"""
+        call, leader = self._join(key)
+
+        if not leader:
+            yield from self._follow(call)
+            return
+
+        try:
+            with closing(fn()) as pieces:
+                for piece in pieces:
+                    with call.changed:
+                        call.parts.append(piece)
+                        call.changed.notify_all()
+                    yield piece
+            call.result = "".join(call.parts)
+        except GeneratorExit:
+            # The leader's caller went away: followers must not take the partial text as complete
+            call.error = RuntimeError("The shared answer stream was closed before it finished")
+            raise
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+
+    def _follow(self, call):
+        sent = 0
+        while True:
+            with call.changed:
+                call.changed.wait_for(lambda: len(call.parts) > sent or call.done.is_set())
+                pieces = call.parts[sent:]
+                finished = call.done.is_set()
+            yield from pieces
+            sent += len(pieces)
+            if finished:
+                break
+        if call.error is not None:
+            raise call.error
+        if not sent and call.result:
+            # Joined a do() call: its result arrives in one piece
+            yield call.result
+
+
+class ConcurrencyLimiter:
+    """At most max_concurrent holders at once and at most max_waiting callers queued"""
+
+    def __init__(self, max_concurrent=4, max_waiting=32, timeout=30.0):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_waiting:
+                    self.rejected += 1
+                    raise GateFullError("Too many pending requests, please retry shortly")
+                self.waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected += 1
+                raise GateFullError("Timed out waiting for a free model slot")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+
+class LLMGate:
+    """Single-flight plus a concurrency limit in front of outbound LLM calls.
+
+    run(key, fn) calls fn() at most once for all concurrent callers with the
+    same key, and only while holding one of the limiter's slots. fn is any
+    callable, so a local fake model can stand in for Gemini in tests.
+    stream(key, fn) does the same for a generator of text pieces; the slot is
+    held until the stream ends.
+    """
+
+    def __init__(self, max_concurrent=4, max_waiting=32, timeout=30.0):
+        self.flight = SingleFlight()
+        self.limiter = ConcurrencyLimiter(max_concurrent, max_waiting, timeout)
+
+    def run(self, key, fn):
+        return self.flight.do(key, lambda: self._limited(fn))
+
+    def stream(self, key, fn):
+        return self.flight.stream(key, lambda: self._limited_stream(fn))
+
+    def _limited(self, fn):
+        with self.limiter.slot():
+            return fn()
+
+    def _limited_stream(self, fn):
+        with self.limiter.slot():
+            yield from fn()
@@ -6,9 +6,10 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
 import warnings
 warnings.filterwarnings("ignore")
-from gcrbot.gemini_tool import ask_gemini
 
 def run():
+    # Light import: the Gemini SDK, .env and the dataset load on the first question
+    from gcrbot.gemini_tool import ask_gemini
     print("PFE Chatbot (type 'quit' to exit)")
     while True:
         q = input("\nYou: ").strip()
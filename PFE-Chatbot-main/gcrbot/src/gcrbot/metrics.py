@@ -0,0 +1,162 @@
+# src/gcrbot/metrics.py
+"""In-process latency histograms and counters, exported in Prometheus text format.
+
+Stages are timed with `with metrics.stage("detect_intent"):` or the
+@metrics.timed("search_ranked") decorator. An observation costs two
+perf_counter() calls, a bisect and an uncontended lock, so timers can stay on
+in production. Values that already live elsewhere, such as the dataset
+size or cache counters, are read only when /metrics is scraped, through
+register_collector().
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds: sub-millisecond index lookups up to a full dataset rebuild
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                   60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination"""
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts (last is +Inf), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, [le])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}" for labels, v in values]
+        return lines
+
+
+# ---------------------------
+# Process-wide metrics
+# ---------------------------
+STAGE_SECONDS = Histogram("pfe_stage_duration_seconds", "Time spent in one processing stage", ["stage"])
+REQUEST_SECONDS = Histogram("pfe_http_request_duration_seconds", "HTTP request latency by endpoint",
+                            ["method", "endpoint"])
+REQUESTS = Counter("pfe_http_requests_total", "HTTP requests by endpoint and status", ["method", "endpoint", "status"])
+
+_metrics = [STAGE_SECONDS, REQUEST_SECONDS, REQUESTS]
+_collectors = []
+
+
+class stage:
+    """Context manager timing a block into pfe_stage_duration_seconds{stage=name}; .seconds once done"""
+
+    __slots__ = ("name", "start", "seconds")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        STAGE_SECONDS.observe(self.seconds, self.name)
+        return False
+
+
+def timed(name):
+    """Decorator form of stage()"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register(metric):
+    """Export a Histogram or Counter created outside this module"""
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(collect):
+    """Add a callable run at scrape time, returning [(name, type, help, [(labels dict, value)])]"""
+    _collectors.append(collect)
+    return collect
+
+
+def render():
+    """Every metric in Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for metric in _metrics:
+        lines += metric.collect()
+    for collect in _collectors:
+        try:
+            families = collect()
+        except Exception as e:
+            # A broken collector must not take the whole scrape down
+            lines.append(f"# collector {getattr(collect, '__name__', collect)} failed: {_escape(e)}")
+            continue
+        for name, kind, help, samples in families:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,74 @@
+# src/gcrbot/tools/dataset.py
+import threading
+import time
+from pathlib import Path
+
+
+class DatasetManager:
+    """Owns the current dataset snapshot and rebuilds it when the file changes.
+
+    Readers call current() and keep the returned snapshot for as long as
+    they need it. Rebuilds run on a background watcher thread and publish
+    the new snapshot with a single reference assignment, so a request never
+    sees a half-built snapshot and never waits for a rebuild (only the very
+    first load blocks).
+    """
+
+    def __init__(self, path, build, interval=5.0):
+        self.path = Path(path)
+        self.build = build
+        self.interval = interval
+        self._snapshot = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def _stat(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def current(self):
+        """Latest complete snapshot, or None if the file could not be loaded"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        if self._watcher is None:
+            self._start_watcher()
+        return snapshot
+
+    def reload(self):
+        """Rebuild now if the file changed since the last build"""
+        with self._lock:
+            signature = self._stat()
+            if signature is None:
+                print(f"[ERROR] CSV not found: {self.path}")
+                self._signature = None
+                return self._snapshot
+            if signature == self._signature:
+                return self._snapshot
+            try:
+                snapshot = self.build(self.path, self._snapshot)
+            except Exception as e:
+                # Keep serving the previous snapshot until the file changes again
+                print(f"[ERROR] Could not load {self.path}: {e}")
+                self._signature = signature
+                return self._snapshot
+            self._signature = signature
+            self._snapshot = snapshot
+            return snapshot
+
+    def _start_watcher(self):
+        with self._lock:
+            if self._watcher is not None or self.interval <= 0:
+                return
+            self._watcher = threading.Thread(target=self._watch, name="dataset-watcher", daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            if self._stat() != self._signature:
+                self.reload()
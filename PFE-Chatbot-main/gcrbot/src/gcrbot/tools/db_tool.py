@@ -1,166 +1,588 @@
 # src/gcrbot/tools/db_tool.py
+import hashlib
+import io
+import json
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from collections import Counter
+from gcrbot import metrics
+from . import render, sqlite_store, taxonomy
+from .dataset import DatasetManager
+from .ranking import BM25Ranker, bm25_weights, top_k
+from .search_index import InvertedIndex, tokenize
+from .semantic import SemanticIndex
+from .similarity import SimilarityGraph
+from .trigram_index import TrigramIndex
+from .snapshot_file import decode_frame, encode_frame, read_snapshot_file, read_snapshot_meta, write_snapshot_file
 
-# Absolute path to CSV
-CSV_PATH = Path("C:/Users/naffe/OneDrive/Desktop/GCRBot/gcrbot/knowledge/pfe_projects.csv")
-_df = None
+# CSV location, overridable with PFE_CSV_PATH (env or .env)
+DEFAULT_CSV_PATH = Path(__file__).resolve().parents[3] / "knowledge" / "pfe_projects.csv"
+CSV_PATH = Path(os.getenv("PFE_CSV_PATH", DEFAULT_CSV_PATH))
 
+# Seconds between checks of the CSV for changes (0 disables hot reload)
+RELOAD_INTERVAL = float(os.getenv("PFE_RELOAD_INTERVAL", "5"))
+
+# Width of the hashed TF-IDF vectors used by semantic search (memory: rows x dim x 4 bytes)
+SEMANTIC_DIM = int(os.getenv("PFE_SEMANTIC_DIM", "512"))
+
+# Neighbours kept per project in the precomputed similarity graph
+SIMILAR_K = int(os.getenv("PFE_SIMILAR_K", "10"))
+
+# "memory" (DataFrame + in-memory indexes) or "sqlite" (indexed database file, see SQLITE STORAGE)
+STORAGE_BACKENDS = ("memory", "sqlite")
+STORAGE = os.getenv("PFE_STORAGE", "memory")
+if STORAGE not in STORAGE_BACKENDS:
+    raise ValueError(f"PFE_STORAGE must be one of {', '.join(STORAGE_BACKENDS)}, not {STORAGE!r}")
+
+class Snapshot:
+    """One fully built version of the dataset and everything derived from it"""
+
+    def __init__(self, df, version, index, ranker, semantic, titles, similar, domain_rows, domain_matrix,
+                 build_seconds=None):
+        self.df = df
+        self.version = version
+        self.index = index
+        self.ranker = ranker
+        self.semantic = semantic
+        self.titles = titles
+        self.similar = similar
+        self.domain_rows = domain_rows
+        self.domain_matrix = domain_matrix
+        self.build_seconds = build_seconds  # {stage: seconds} when built from the CSV
+
+def build_snapshot(path, previous=None):
+    """Load the dataset from its compiled snapshot file when fresh, else rebuild from the CSV"""
+    path = Path(path)
+    stat = path.stat()
+    compiled = path.with_suffix(".snapshot")
+
+    snapshot = read_compiled_snapshot(compiled, stat) if SNAPSHOT_ENABLED else None
+    if snapshot is None:
+        raw = path.read_bytes()
+        version = hashlib.sha1(raw).hexdigest()[:16]
+        if previous is not None and previous.version == version:
+            snapshot = previous  # File touched but content unchanged
+        else:
+            snapshot = _build_from_csv(raw, version)
+        if SNAPSHOT_ENABLED:
+            write_compiled_snapshot(snapshot, compiled, stat)
+
+    if previous is not None and previous.version == snapshot.version:
+        return previous
+    return snapshot
+
+@metrics.timed("build_dataset")
+def _build_from_csv(raw, version):
+    seconds = {}
+
+    with _build_stage("read_csv", seconds):
+        df = pd.read_csv(io.BytesIO(raw))
+        df['title_lower'] = df['title'].str.lower()
+        df['specialty_lower'] = df['specialty'].str.lower()
+    with _build_stage("enrich", seconds):
+        enrich(df)
+
+    # Inverted index built once, so searches never rescan the DataFrame
+    with _build_stage("search_index", seconds):
+        index = InvertedIndex.from_columns({
+            "title": df['title_lower'],
+            "specialty": df['specialty_lower'],
+            "student": df['student'].str.lower(),
+        })
+        # BM25 weights precomputed from the index's term frequencies and field lengths
+        ranker = BM25Ranker(index, bm25_weights(index))
+
+    # TF-IDF vectors of title + specialty for offline semantic search
+    with _build_stage("semantic", seconds):
+        semantic = SemanticIndex.from_texts(df['title'] + " " + df['specialty'], df['domains'], dim=SEMANTIC_DIM)
+
+    # Title trigrams for typo-tolerant title lookups (/compare)
+    with _build_stage("trigrams", seconds):
+        titles = TrigramIndex.from_texts(df['title'].tolist())
+
+    # Nearest projects of every project, scored like calculate_similarity_score()
+    with _build_stage("similarity", seconds):
+        similar = SimilarityGraph.build(df['technologies'].tolist(), df['specialty'].tolist(),
+                                        df['complexity'].tolist(), df['duration'].tolist(),
+                                        SIMILARITY_POINTS, SIMILARITY_CAP, SIMILAR_K)
+
+    with _build_stage("domains", seconds):
+        # Row ids per taxonomy domain, from the tags computed by enrich()
+        rows = {domain: [] for domain in taxonomy.DOMAINS}
+        for row_id, domains in enumerate(df['domains']):
+            for domain in domains:
+                rows[domain].append(row_id)
+        domain_rows = {domain: np.asarray(ids, dtype=np.int32) for domain, ids in rows.items()}
+
+        # Same tags as a 0/1 project x domain matrix for profile scoring
+        domain_matrix = np.zeros((len(df), len(taxonomy.DOMAINS)), dtype=np.float32)
+        for col, domain in enumerate(taxonomy.DOMAINS):
+            domain_matrix[domain_rows[domain], col] = 1.0
+
+    return Snapshot(df, version, index, ranker, semantic, titles, similar, domain_rows, domain_matrix,
+                    build_seconds=seconds)
+
+@contextmanager
+def _build_stage(name, seconds):
+    """Time one step of _build_from_csv() as stage build_<name>, and note it in seconds"""
+    with metrics.stage(f"build_{name}") as timer:
+        yield
+    seconds[name] = timer.seconds
+
+# ============================================
+# COMPILED SNAPSHOT FILE (fast start)
+# ============================================
+# Written next to the CSV as <name>.snapshot. It is used only while the CSV's
+# mtime and size match the ones it was built from and the keyword rules
+# are unchanged, so it never needs to be cleaned up by hand.
+
+SNAPSHOT_FORMAT = 6
+SNAPSHOT_ENABLED = os.getenv("PFE_SNAPSHOT", "1") != "0"
+
+def _rules_fingerprint(*settings):
+    """Hash of every keyword table the derived columns depend on, plus the given index settings"""
+    rules = [taxonomy.DOMAINS, taxonomy.PROFILE_HINTS, taxonomy.TECHNOLOGIES, DURATION_RULES,
+             COMPLEXITY_RULES, VALUE_RULES, REQUIRED_SKILLS, TECH_TO_TOOLS, COMPLEX_TITLE_KEYWORDS,
+             sorted(taxonomy.STOPWORDS), *settings]
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def _snapshot_fingerprint():
+    """Rules plus the settings of the in-memory indexes (the SQLite database does not depend on them)"""
+    return _rules_fingerprint(SEMANTIC_DIM, SIMILARITY_POINTS, SIMILARITY_CAP, SIMILAR_K)
+
+def write_compiled_snapshot(snapshot, path, csv_stat):
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "version": snapshot.version,
+        "fingerprint": _snapshot_fingerprint(),
+        "csv_mtime_ns": csv_stat.st_mtime_ns,
+        "csv_size": csv_stat.st_size,
+    }
+    arrays = {
+        "domain_matrix": snapshot.domain_matrix,
+        "semantic.matrix": snapshot.semantic.matrix,
+        "semantic.idf": snapshot.semantic.idf,
+        "titles.offsets": snapshot.titles.offsets,
+        "titles.ids": snapshot.titles.ids,
+        "titles.sizes": snapshot.titles.sizes,
+        "similar.ids": snapshot.similar.ids,
+        "similar.scores": snapshot.similar.scores,
+    }
+    vocab = {}
+    for field, (field_vocab, offsets, ids) in snapshot.index.tables.items():
+        vocab[field] = field_vocab
+        arrays[f"index.{field}.offsets"] = offsets
+        arrays[f"index.{field}.ids"] = ids
+        arrays[f"bm25.{field}"] = snapshot.ranker.weights[field]
+    domain_ids = [snapshot.domain_rows[d] for d in taxonomy.DOMAINS]
+    arrays["domains.offsets"] = np.concatenate([[0], np.cumsum([len(ids) for ids in domain_ids])]).astype(np.int64)
+    arrays["domains.ids"] = np.concatenate(domain_ids).astype(np.int32)
+    columns, frame_arrays, documents = encode_frame(snapshot.df, "df")
+    arrays.update(frame_arrays)
+    documents.update({"index.vocab": vocab, "titles.vocab": list(snapshot.titles.vocab)})
+    meta["columns"] = columns
+    try:
+        write_snapshot_file(path, meta, arrays, documents)
+    except OSError as e:
+        print(f"[WARNING] Could not write snapshot {path}: {e}")
+
+@metrics.timed("read_snapshot_file")
+def read_compiled_snapshot(path, csv_stat):
+    """Snapshot from a compiled file, or None if it is missing or stale"""
+    header = read_snapshot_meta(path)
+    if header is None:
+        return None
+    meta = header["meta"]
+    if (meta.get("format") != SNAPSHOT_FORMAT
+            or meta.get("fingerprint") != _snapshot_fingerprint()
+            or meta.get("csv_mtime_ns") != csv_stat.st_mtime_ns
+            or meta.get("csv_size") != csv_stat.st_size):
+        return None
+    try:
+        meta, arrays, documents = read_snapshot_file(path, header)
+        df = decode_frame(meta["columns"], arrays, documents, "df")
+    except Exception as e:
+        print(f"[WARNING] Ignoring unreadable snapshot {path}: {e}")
+        return None
+    vocab = documents["index.vocab"]
+
+    index = InvertedIndex({
+        field: (field_vocab, arrays[f"index.{field}.offsets"], arrays[f"index.{field}.ids"])
+        for field, field_vocab in vocab.items()
+    })
+    ranker = BM25Ranker(index, {field: arrays[f"bm25.{field}"] for field in vocab})
+    semantic = SemanticIndex(arrays["semantic.matrix"], arrays["semantic.idf"])
+    titles = TrigramIndex(documents["titles.vocab"], arrays["titles.offsets"], arrays["titles.ids"], arrays["titles.sizes"])
+    similar = SimilarityGraph(arrays["similar.ids"], arrays["similar.scores"])
+    offsets, ids = arrays["domains.offsets"], arrays["domains.ids"]
+    domain_rows = {d: ids[offsets[i]:offsets[i + 1]] for i, d in enumerate(taxonomy.DOMAINS)}
+    return Snapshot(df, meta["version"], index, ranker, semantic, titles, similar,
+                    domain_rows, arrays["domain_matrix"])
+
+def compile_snapshot():
+    """Rebuild the compiled snapshot (or the SQLite database) from the CSV, e.g. as a deploy step"""
+    stat = CSV_PATH.stat()
+    if STORAGE == "sqlite":
+        db_path = import_sqlite(CSV_PATH, stat)
+        _remove_sqlite_files(keep=[db_path])
+        print(f"[INFO] Database written: {db_path} ({sqlite_store.read_meta(db_path)['rows']} projects)")
+        return
+    raw = CSV_PATH.read_bytes()
+    snapshot = _build_from_csv(raw, hashlib.sha1(raw).hexdigest()[:16])
+    write_compiled_snapshot(snapshot, CSV_PATH.with_suffix(".snapshot"), stat)
+    print(f"[INFO] Snapshot written: {CSV_PATH.with_suffix('.snapshot')} ({len(snapshot.df)} projects)")
+    print("[INFO] Build time: " + ", ".join(f"{name} {secs:.2f}s" for name, secs in snapshot.build_seconds.items()))
+
+# ============================================
+# SQLITE STORAGE (PFE_STORAGE=sqlite)
+# ============================================
+# The CSV is imported chunk by chunk into <name>.<version>.sqlite next to it
+# (PFE_SQLITE_PATH=dir/name.sqlite moves it), again whenever its mtime or
+# size or the keyword rules change. Each content version gets its own file,
+# so a request still pinned to the previous version keeps reading it while
+# the next one is imported; older versions have their connections closed
+# and their files removed. Listings, counts,
+# /stats and profile scores are indexed SQL queries and the catalogue is
+# never held in memory. Semantic search needs the in-memory TF-IDF vectors,
+# so only the memory backend offers it.
+
+SQLITE_PATH = Path(os.getenv("PFE_SQLITE_PATH", CSV_PATH.with_suffix(".sqlite")))
+
+def _file_version(path):
+    """Same content hash as build_snapshot(), read in blocks"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def _sqlite_files():
+    """Database files of every imported version"""
+    return SQLITE_PATH.parent.glob(f"{SQLITE_PATH.stem}.*{SQLITE_PATH.suffix}")
+
+# Stores opened by build_store(), so their connections are closed before their files go
+_stores = []
+
+def _close_stores(keep):
+    """Close the connections of the stores whose file is not in keep"""
+    for store in [store for store in _stores if store.path not in keep]:
+        store.close()
+        _stores.remove(store)
+
+def _remove_sqlite_files(keep):
+    """Close the stores of versions not in keep, then delete their database files"""
+    _close_stores(keep)
+    for old in _sqlite_files():
+        if old not in keep:
+            old.unlink(missing_ok=True)
+
+def _fresh_store_meta(db_path, csv_stat):
+    """meta of a database imported from the CSV as it is now, None if stale"""
+    meta = sqlite_store.read_meta(db_path)
+    if (meta is None
+            or meta.get("format") != sqlite_store.STORE_FORMAT
+            or meta.get("fingerprint") != _rules_fingerprint()
+            or meta.get("csv_mtime_ns") != csv_stat.st_mtime_ns
+            or meta.get("csv_size") != csv_stat.st_size):
+        return None
+    return meta
+
+@metrics.timed("import_sqlite")
+def import_sqlite(path, csv_stat):
+    """Import the CSV into the database file of its version; returns that file's path"""
+    version = _file_version(path)
+    db_path = SQLITE_PATH.with_name(f"{SQLITE_PATH.stem}.{version}{SQLITE_PATH.suffix}")
+    meta = {
+        "format": sqlite_store.STORE_FORMAT,
+        "version": version,
+        "fingerprint": _rules_fingerprint(),
+        "csv_mtime_ns": csv_stat.st_mtime_ns,
+        "csv_size": csv_stat.st_size,
+    }
+    sqlite_store.build(path, db_path, enrich, meta)
+    return db_path
+
+def build_store(path, previous=None):
+    """Open the SQLite database of the CSV, importing the CSV first when no database is fresh"""
+    stat = Path(path).stat()
+    db_path = meta = None
+    for candidate in _sqlite_files():
+        meta = _fresh_store_meta(candidate, stat)
+        if meta is not None:
+            db_path = candidate
+            break
+    imported = meta is None
+    if imported:
+        db_path = import_sqlite(path, stat)
+        meta = sqlite_store.read_meta(db_path)
+    if previous is not None and previous.version == meta["version"]:
+        store = previous
+    else:
+        store = sqlite_store.SQLiteStore(db_path, meta)
+        _stores.append(store)
+    # Keep the version the previous version's requests may still read
+    keep = [db_path] + ([previous.path] if previous is not None else [])
+    if imported:
+        _remove_sqlite_files(keep)
+    else:
+        _close_stores(keep)
+    return store
+
+# ============================================
+# DATASET ACCESS (either backend)
+# ============================================
+
+_manager = DatasetManager(CSV_PATH, build_store if STORAGE == "sqlite" else build_snapshot, interval=RELOAD_INTERVAL)
+_local = threading.local()
+
+def get_snapshot():
+    """Snapshot (a SQLiteStore with PFE_STORAGE=sqlite) pinned to this thread, else the latest (None if unavailable)"""
+    snapshot = getattr(_local, "snapshot", None)
+    return snapshot if snapshot is not None else _manager.current()
+
+def pin_snapshot():
+    """Make every db_tool call on this thread use one snapshot until unpin_snapshot()"""
+    _local.snapshot = _manager.current()
+
+def unpin_snapshot():
+    _local.snapshot = None
+
+def reload_data():
+    """Rebuild the dataset now if the CSV changed, instead of waiting for the watcher"""
+    snapshot = _manager.reload()
+    if snapshot is None:
+        return None
+    return snapshot.frame() if STORAGE == "sqlite" else snapshot.df
+
+@metrics.timed("load_data")
 def load_data():
-    global _df
-    if _df is not None:
-        return _df
+    """The whole dataset as a DataFrame; with the sqlite backend this reads every row, prefer the queries below"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None
+    return snapshot.frame() if STORAGE == "sqlite" else snapshot.df
+
+def dataset_version():
+    """Content hash of the loaded CSV, changes whenever the data does"""
+    snapshot = get_snapshot()
+    return snapshot.version if snapshot is not None else None
+
+@metrics.register_collector
+def _dataset_metrics():
+    """Size and version of the loaded dataset, read at scrape time"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return []
+    return [
+        ("pfe_dataset_projects", "gauge", "Projects in the loaded dataset", [({}, project_count())]),
+        ("pfe_dataset_info", "gauge", "Version (content hash) of the loaded dataset",
+         [({"version": snapshot.version}, 1)]),
+    ]
+
+def project_count():
+    """Number of projects in the dataset"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return 0
+    return snapshot.rows if STORAGE == "sqlite" else len(snapshot.df)
+
+def value_counts(column, limit=None):
+    """{value: number of projects} for specialty, year or student, most frequent first"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return {}
+    if STORAGE == "sqlite":
+        return snapshot.value_counts(column, limit)
+    counts = snapshot.df[column].value_counts()
+    return (counts if limit is None else counts.head(limit)).to_dict()
+
+def list_projects(offset=0, limit=None):
+    """Projects in file order, `limit` of them from row `offset` on"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None
+    if STORAGE == "sqlite":
+        return snapshot.page(offset, -1 if limit is None else limit)
+    return snapshot.df.iloc[offset:None if limit is None else offset + limit]
+
+def find_projects(terms, fields=("title", "specialty")):
+    """Return the projects matching any of the terms, in file order"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None
+    if STORAGE == "sqlite":
+        return snapshot.search([], match_terms=[tokenize(term) for term in terms], fields=fields)[0]
+    return snapshot.df.iloc[snapshot.index.match_any(terms, fields)]
 
-    if not CSV_PATH.exists():
-        print(f"[ERROR] CSV not found: {CSV_PATH}")
+def find_domain(domain):
+    """Return the projects tagged with a taxonomy domain, in file order"""
+    snapshot = get_snapshot()
+    if snapshot is None:
         return None
+    if STORAGE == "sqlite":
+        return snapshot.search([], domain=domain)[0]
+    return snapshot.df.iloc[snapshot.domain_rows[domain]]
 
-    _df = pd.read_csv(CSV_PATH)
-    _df['title_lower'] = _df['title'].str.lower()
-    _df['specialty_lower'] = _df['specialty'].str.lower()
-    return _df
+def count_domain(domain):
+    """Count the projects tagged with a taxonomy domain"""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return 0
+    if STORAGE == "sqlite":
+        return snapshot.count_domain(domain)
+    return len(snapshot.domain_rows[domain])
 
 # ============================================
 # COMPARISON FEATURE - NEW FUNCTIONS
 # ============================================
 
-TECH_KEYWORDS = {
-    "Python": ["python", "py"],
-    "Machine Learning": ["ml", "machine learning", "deep learning", "incremental learning"],
-    "AI": ["ai", "intelligence artificielle", "artificial intelligence", "intelligent"],
-    "Web": ["django", "react", "angular", "web", "spring boot", "platform"],
-    "Security": ["wazuh", "siem", "soar", "cyber", "pentest", "security", "firewall", "fortinet", "palo alto"],
-    "Networking": ["eigrp", "ospf", "network", "routing", "sd-wan", "cisco", "meraki"],
-    "Mobile Networks": ["4g", "5g", "telecommunications", "ftto", "ftta"],
-    "Cloud": ["oci", "aws", "gcp", "cloud", "docker", "kubernetes"],
-    "IaaC": ["iaac", "terraform", "orchestration", "infrastructure as code"],
-    "Blockchain": ["blockchain", "iota", "dlc", "distributed ledger"],
-    "IoT": ["iot", "internet of things", "embedded", "sensor"],
-    "Automation": ["automation", "automated", "automate"],
-    "Computer Vision": ["ocr", "image processing", "computer vision", "gesture"],
-    "Quality Assurance": ["testing", "quality", "qa", "qos"]
+# Keyword rules, checked in order: the first matching tier wins
+DURATION_RULES = [
+    ("4-5 months", ["deep learning", "intelligent", "optimization", "design and implementation", "multi-instance"]),
+    ("3-4 months", ["ai", "machine learning", "siem", "soar", "orchestration", "iaac platform"]),
+    ("2-3 months", ["web", "platform", "mobile application", "blockchain", "automation"]),
+    ("1-2 months", ["study", "analysis", "testing", "generator", "interface"]),
+]
+DEFAULT_DURATION = "2-3 months"
+
+COMPLEXITY_RULES = [
+    ("Advanced", [
+        "deep learning", "ai agent", "intelligent", "optimization",
+        "orchestration", "multi-instance", "distributed", "blockchain",
+        "iaac platform", "siem", "soar", "sd-wan architecture"
+    ]),
+    ("Intermediate", [
+        "implementation", "deployment", "automation", "platform",
+        "web development", "network security", "machine learning",
+        "mobile application", "integration"
+    ]),
+]
+DEFAULT_COMPLEXITY = "Beginner"
+
+VALUE_RULES = [
+    ("Very High (Innovation + Automation)", ["automation", "ai", "intelligent", "optimization", "orchestration"]),
+    ("High (Enterprise-grade solution)", ["security", "siem", "cloud", "iaac", "blockchain", "quality"]),
+    ("Medium (Business solution)", ["platform", "web", "mobile", "management", "monitoring"]),
+]
+DEFAULT_VALUE = "Moderate (Learning project)"
+
+# Title words that mark a project as demanding for the profile level bonus
+COMPLEX_TITLE_KEYWORDS = ["implementation", "design", "optimization", "intelligent", "advanced"]
+
+REQUIRED_SKILLS = {
+    "Advanced": "Expert (Strong technical background required)",
+    "Intermediate": "Intermediate (Good fundamentals required)",
+    "Beginner": "Beginner (Basic knowledge sufficient)",
 }
 
+TECH_TO_TOOLS = {
+    "Python": ["Python 3.x", "VS Code/PyCharm"],
+    "Machine Learning": ["TensorFlow/PyTorch", "Jupyter Notebook", "scikit-learn"],
+    "AI": ["TensorFlow/Keras", "OpenCV (if vision)", "Google Colab"],
+    "Web": ["Node.js/npm", "React/Angular CLI", "Postman"],
+    "Security": ["Wazuh/Splunk", "Kali Linux", "Wireshark"],
+    "Networking": ["Cisco Packet Tracer", "GNS3", "Wireshark"],
+    "Mobile Networks": ["Network simulators", "Spectrum analyzers"],
+    "Cloud": ["Docker", "AWS/GCP account", "Terraform"],
+    "IaaC": ["Terraform", "Ansible", "Git"],
+    "Blockchain": ["Solidity", "Web3.js", "MetaMask"],
+    "IoT": ["Arduino IDE", "Raspberry Pi", "MQTT broker"],
+    "Automation": ["Python", "Ansible", "Jenkins/GitLab CI"],
+    "Computer Vision": ["OpenCV", "TensorFlow", "Python"],
+    "Quality Assurance": ["Selenium", "JUnit/TestNG", "Postman"]
+}
+
+def _first_rule(text, rules, default):
+    for label, keywords in rules:
+        if any(k in text for k in keywords):
+            return label
+    return default
+
 def extract_technologies(text):
     """Extract technologies from project title"""
-    text = text.lower()
-    used = []
-    
-    for tech, keywords in TECH_KEYWORDS.items():
-        if any(k in text for k in keywords):
-            used.append(tech)
-    
+    used = taxonomy.technologies(text)
     return used if used else ["General IT"]
 
 def estimate_duration(title):
     """Estimate project duration based on keywords"""
-    t = title.lower()
-    
-    # Long duration projects (4-5 months)
-    if any(k in t for k in ["deep learning", "intelligent", "optimization", "design and implementation", "multi-instance"]):
-        return "4-5 months"
-    
-    # Medium-long duration (3-4 months)
-    if any(k in t for k in ["ai", "machine learning", "siem", "soar", "orchestration", "iaac platform"]):
-        return "3-4 months"
-    
-    # Medium duration (2-3 months)
-    if any(k in t for k in ["web", "platform", "mobile application", "blockchain", "automation"]):
-        return "2-3 months"
-    
-    # Short duration (1-2 months)
-    if any(k in t for k in ["study", "analysis", "testing", "generator", "interface"]):
-        return "1-2 months"
-    
-    return "2-3 months"  # Default
+    return _first_rule(title.lower(), DURATION_RULES, DEFAULT_DURATION)
 
 def estimate_complexity(title, specialty):
     """Estimate project complexity"""
-    t = (title + " " + specialty).lower()
-    
-    # Advanced complexity
-    advanced_keywords = [
-        "deep learning", "ai agent", "intelligent", "optimization", 
-        "orchestration", "multi-instance", "distributed", "blockchain",
-        "iaac platform", "siem", "soar", "sd-wan architecture"
-    ]
-    
-    if any(k in t for k in advanced_keywords):
-        return "Advanced"
-    
-    # Intermediate complexity
-    intermediate_keywords = [
-        "implementation", "deployment", "automation", "platform",
-        "web development", "network security", "machine learning",
-        "mobile application", "integration"
-    ]
-    
-    if any(k in t for k in intermediate_keywords):
-        return "Intermediate"
-    
-    # Beginner complexity
-    return "Beginner"
+    return _first_rule((title + " " + specialty).lower(), COMPLEXITY_RULES, DEFAULT_COMPLEXITY)
 
 def estimate_value_added(title, specialty):
     """Estimate value added by the project"""
-    t = (title + " " + specialty).lower()
-    
-    # Very High Value
-    if any(k in t for k in ["automation", "ai", "intelligent", "optimization", "orchestration"]):
-        return "Very High (Innovation + Automation)"
-    
-    # High Value
-    if any(k in t for k in ["security", "siem", "cloud", "iaac", "blockchain", "quality"]):
-        return "High (Enterprise-grade solution)"
-    
-    # Medium Value
-    if any(k in t for k in ["platform", "web", "mobile", "management", "monitoring"]):
-        return "Medium (Business solution)"
-    
-    return "Moderate (Learning project)"
+    return _first_rule((title + " " + specialty).lower(), VALUE_RULES, DEFAULT_VALUE)
 
-def estimate_required_skills(title, specialty):
+def estimate_required_skills(title, specialty, complexity=None):
     """Estimate required skill level"""
-    complexity = estimate_complexity(title, specialty)
-    
-    if complexity == "Advanced":
-        return "Expert (Strong technical background required)"
-    elif complexity == "Intermediate":
-        return "Intermediate (Good fundamentals required)"
-    else:
-        return "Beginner (Basic knowledge sufficient)"
+    if complexity is None:
+        complexity = estimate_complexity(title, specialty)
+    return REQUIRED_SKILLS[complexity]
 
 def get_tools_required(technologies):
     """Get tools required based on technologies"""
-    tools = set()
-    
-    tech_to_tools = {
-        "Python": ["Python 3.x", "VS Code/PyCharm"],
-        "Machine Learning": ["TensorFlow/PyTorch", "Jupyter Notebook", "scikit-learn"],
-        "AI": ["TensorFlow/Keras", "OpenCV (if vision)", "Google Colab"],
-        "Web": ["Node.js/npm", "React/Angular CLI", "Postman"],
-        "Security": ["Wazuh/Splunk", "Kali Linux", "Wireshark"],
-        "Networking": ["Cisco Packet Tracer", "GNS3", "Wireshark"],
-        "Mobile Networks": ["Network simulators", "Spectrum analyzers"],
-        "Cloud": ["Docker", "AWS/GCP account", "Terraform"],
-        "IaaC": ["Terraform", "Ansible", "Git"],
-        "Blockchain": ["Solidity", "Web3.js", "MetaMask"],
-        "IoT": ["Arduino IDE", "Raspberry Pi", "MQTT broker"],
-        "Automation": ["Python", "Ansible", "Jenkins/GitLab CI"],
-        "Computer Vision": ["OpenCV", "TensorFlow", "Python"],
-        "Quality Assurance": ["Selenium", "JUnit/TestNG", "Postman"]
-    }
-    
-    for tech in technologies:
-        if tech in tech_to_tools:
-            tools.update(tech_to_tools[tech])
-    
-    if not tools:
-        tools.add("Standard IDE")
-        tools.add("Git")
-    
-    return list(tools)
+    tools = list(dict.fromkeys(tool for tech in technologies for tool in TECH_TO_TOOLS.get(tech, [])))
+    return tools if tools else ["Standard IDE", "Git"]
+
+# ============================================
+# PRECOMPUTED ENRICHMENT (built once per load)
+# ============================================
+
+ENRICHMENT_COLUMNS = ["domains", "technologies", "duration", "complexity", "value_added", "required_skills",
+                      "tools_required", "is_complex"]
+
+def _contains_any(texts, keywords):
+    mask = np.zeros(len(texts), dtype=bool)
+    for k in keywords:
+        mask |= texts.str.contains(k, regex=False, na=False).to_numpy()
+    return mask
+
+def _select_rule(texts, rules, default):
+    masks = [_contains_any(texts, keywords) for _, keywords in rules]
+    return np.select(masks, [label for label, _ in rules], default=default).tolist()
+
+def enrich(df):
+    """Add the comparison columns to df, one keyword pass per rule over the whole frame"""
+    title = df['title'].fillna('').str.lower()
+    title_specialty = title + " " + df['specialty'].fillna('').str.lower()
+
+    # One taxonomy pass per project gives both its technologies and domains
+    technologies = []
+    domains = []
+    for title_tags, specialty_tags in zip(map(taxonomy.tag, title), map(taxonomy.tag, df['specialty'])):
+        technologies.append(title_tags["tech"] or ["General IT"])
+        domains.append(list(dict.fromkeys(title_tags["domain"] + specialty_tags["domain"])))
+
+    # Few distinct technology sets exist, so tools are resolved once per set
+    tools_by_set = {}
+    tools = []
+    for techs in technologies:
+        key = tuple(techs)
+        if key not in tools_by_set:
+            tools_by_set[key] = get_tools_required(techs)
+        tools.append(tools_by_set[key])
+
+    complexity = _select_rule(title_specialty, COMPLEXITY_RULES, DEFAULT_COMPLEXITY)
+
+    df['domains'] = pd.Series(domains, index=df.index, dtype=object)
+    df['technologies'] = pd.Series(technologies, index=df.index, dtype=object)
+    df['duration'] = _select_rule(title, DURATION_RULES, DEFAULT_DURATION)
+    df['complexity'] = complexity
+    df['value_added'] = _select_rule(title_specialty, VALUE_RULES, DEFAULT_VALUE)
+    df['required_skills'] = [REQUIRED_SKILLS[c] for c in complexity]
+    df['tools_required'] = pd.Series(tools, index=df.index, dtype=object)
+    df['is_complex'] = _contains_any(title, COMPLEX_TITLE_KEYWORDS)
+    return df
+
+# Points per shared technology and per matching attribute
+SIMILARITY_POINTS = {"technology": 10, "specialty": 15, "complexity": 10, "duration": 5}
+SIMILARITY_CAP = 100
 
 def calculate_similarity_score(project1_info, project2_info):
     """Calculate similarity score between two projects"""
@@ -170,104 +592,370 @@ def calculate_similarity_score(project1_info, project2_info):
     tech1 = set(project1_info["technologies"])
     tech2 = set(project2_info["technologies"])
     tech_overlap = len(tech1.intersection(tech2))
-    score += tech_overlap * 10
+    score += tech_overlap * SIMILARITY_POINTS["technology"]
     
     # Same specialty
     if project1_info["specialty"] == project2_info["specialty"]:
-        score += 15
+        score += SIMILARITY_POINTS["specialty"]
     
     # Similar complexity
     if project1_info["complexity"] == project2_info["complexity"]:
-        score += 10
+        score += SIMILARITY_POINTS["complexity"]
     
     # Similar duration
     if project1_info["duration"] == project2_info["duration"]:
-        score += 5
+        score += SIMILARITY_POINTS["duration"]
     
-    return min(score, 100)  # Cap at 100
+    return min(score, SIMILARITY_CAP)
 
-def get_project_comparison_info(title):
-    """Get detailed information about a project for comparison"""
-    df = load_data()
-    if df is None:
-        return None
-    
-    title_lower = title.lower()
-    mask = df["title_lower"].str.contains(title_lower, case=False, na=False)
-    
-    if not mask.any():
-        return None
-    
-    row = df[mask].iloc[0]
-    technologies = extract_technologies(row["title"])
-    
-    info = {
+# ============================================
+# TITLE RESOLUTION
+# ============================================
+
+# Share of the input's trigrams a title must contain to be picked
+RESOLVE_MIN_SCORE = 0.5
+# The best title must beat the runner-up by this much, or the input is ambiguous
+RESOLVE_MARGIN = 0.15
+# Share of trigrams needed to be offered as a candidate
+SUGGEST_MIN_SCORE = 0.3
+RESOLVE_CANDIDATES = 5
+# Inputs without a word this long ("C++", "ai") are too vague to resolve
+RESOLVE_MIN_WORD = 3
+# Best-scoring rows checked for a literal (non-regex) substring match
+RESOLVE_POOL = 100
+
+def _resolvable(title):
+    return any(len(word) >= RESOLVE_MIN_WORD for word in tokenize(title))
+
+@metrics.timed("resolve_title")
+def _resolve_title(snapshot, title, limit=RESOLVE_CANDIDATES):
+    """Resolve free text to one project by title trigram similarity.
+
+    Returns (row id or None, candidates), candidates being the best
+    [(row id, score)] when the input is ambiguous or not found. A title
+    containing the input literally wins, unless several do.
+    """
+    if not _resolvable(title):
+        return None, []
+    rows, containment, jaccard = snapshot.titles.search(title, min_share=SUGGEST_MIN_SCORE)
+    if len(rows) == 0:
+        return None, []
+
+    if len(rows) > RESOLVE_POOL:
+        # Best pool first (containment, then jaccard), the full sort on the pool only
+        top = np.argpartition(-(containment * 2 + jaccard), RESOLVE_POOL - 1)[:RESOLVE_POOL]
+        rows, containment, jaccard = rows[top], containment[top], jaccard[top]
+    order = np.lexsort((rows, -jaccard, -containment))
+    rows, containment, jaccard = rows[order], containment[order], jaccard[order]
+
+    # Plain substring test on the best candidates only; the input is never a regex
+    needle = " ".join(title.lower().split())
+    titles = snapshot.df['title_lower'].array[rows].tolist()
+    literal = np.array([needle in t for t in titles], dtype=bool)
+    exact = np.array([needle == t for t in titles], dtype=bool)
+    if exact.any():
+        return int(rows[exact.argmax()]), []
+    if literal.sum() == 1:
+        return int(rows[literal.argmax()]), []
+
+    if literal.any():
+        # Several titles contain the input: closest titles first
+        picked = np.flatnonzero(literal)
+        picked = picked[np.lexsort((picked, -jaccard[picked]))]
+    else:
+        best = containment[0]
+        runner_up = containment[1] if len(rows) > 1 else 0.0
+        if best >= RESOLVE_MIN_SCORE and best - runner_up >= RESOLVE_MARGIN:
+            return int(rows[0]), []
+        picked = np.flatnonzero(containment >= SUGGEST_MIN_SCORE)
+    return None, [(int(rows[i]), round(float(containment[i]), 2)) for i in picked[:limit]]
+
+@metrics.timed("resolve_title")
+def _resolve_title_sql(store, title, limit=RESOLVE_CANDIDATES):
+    """_resolve_title() on the SQLite backend, with title words from the FTS5 index instead of trigrams.
+
+    Returns (project row or None, candidate dicts as in resolve_project()).
+    """
+    if not _resolvable(title):
+        return None, []
+    needle = " ".join(title.lower().split())
+    exact = store.exact_title(needle)
+    if len(exact):
+        return exact.iloc[0], []
+    words = list(dict.fromkeys(tokenize(needle)))
+    if not words:
+        return None, []
+
+    rows = store.title_matches(words, "AND", RESOLVE_POOL)
+    if len(rows):
+        literal = np.array([needle in t for t in rows['title_lower'].tolist()], dtype=bool)
+        if literal.sum() == 1:
+            return rows[literal].iloc[0], []
+        if len(rows) == 1:
+            return rows.iloc[0], []
+        picked = rows[literal] if literal.any() else rows
+        scores = np.ones(len(picked))
+    else:
+        # No title has every word: rank by the share of the words each one has
+        rows = store.title_matches(words, "OR", RESOLVE_POOL)
+        if not len(rows):
+            return None, []
+        scores = np.array([len(set(words) & set(tokenize(t))) / len(words) for t in rows['title_lower'].tolist()])
+        order = np.argsort(-scores, kind="stable")
+        rows, scores = rows.iloc[order], scores[order]
+        runner_up = scores[1] if len(scores) > 1 else 0.0
+        if scores[0] >= RESOLVE_MIN_SCORE and scores[0] - runner_up >= RESOLVE_MARGIN:
+            return rows.iloc[0], []
+        keep = scores >= SUGGEST_MIN_SCORE
+        picked, scores = rows[keep], scores[keep]
+    return None, render.records(picked.head(limit), ["title", "student", "specialty"],
+                                score=[round(float(score), 2) for score in scores[:limit]])
+
+def _comparison_info(row):
+    """Comparison fields of one project row, precomputed by enrich() at load time"""
+    return {
         "title": str(row["title"]),
         "student": str(row["student"]),
         "specialty": str(row["specialty"]),
         "year": int(row["year"]) if pd.notna(row["year"]) else 0,  # Convert to native Python int
-        "technologies": technologies,
-        "duration": estimate_duration(row["title"]),
-        "complexity": estimate_complexity(row["title"], row["specialty"]),
-        "value_added": estimate_value_added(row["title"], row["specialty"]),
-        "required_skills": estimate_required_skills(row["title"], row["specialty"]),
-        "tools_required": get_tools_required(technologies)
+        "technologies": list(row["technologies"]),
+        "duration": row["duration"],
+        "complexity": row["complexity"],
+        "value_added": row["value_added"],
+        "required_skills": row["required_skills"],
+        "tools_required": list(row["tools_required"])
     }
-    
-    return info
+
+def resolve_project(title):
+    """Comparison info for the project a free-text title designates.
+
+    Returns (info or None, candidates); candidates are dicts with title,
+    student, specialty and score for the caller to disambiguate.
+    """
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None, []
+    if STORAGE == "sqlite":
+        project, candidates = _resolve_title_sql(snapshot, title)
+        return (_comparison_info(project), []) if project is not None else (None, candidates)
+    df = snapshot.df
+    row_id, candidates = _resolve_title(snapshot, title)
+    if row_id is not None:
+        return _comparison_info(df.iloc[row_id]), []
+    return None, _candidate_list(df, candidates)
+
+def _candidate_list(df, candidates):
+    """[(row id, score)] from _resolve_title() as dicts for the API"""
+    if not candidates:
+        return []
+    rows, scores = zip(*candidates)
+    return render.records(df.iloc[list(rows)], ["title", "student", "specialty"], score=list(scores))
+
+def get_project_comparison_info(title):
+    """Get detailed information about a project for comparison"""
+    return resolve_project(title)[0]
+
+def similar_projects(title, limit=None):
+    """Nearest projects of the one a free-text title designates, from the precomputed graph.
+
+    Returns (info, similar, candidates): info and similar are None when the
+    title is ambiguous or unknown, candidates as in resolve_project().
+    """
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None, None, []
+    if STORAGE == "sqlite":
+        # Scored on the fly in SQL, capped like the precomputed graph
+        project, candidates = _resolve_title_sql(snapshot, title)
+        if project is None:
+            return None, None, candidates
+        neighbors, scores = snapshot.similar(project, SIMILARITY_POINTS, SIMILARITY_CAP,
+                                             SIMILAR_K if limit is None else min(limit, SIMILAR_K))
+    else:
+        df = snapshot.df
+        row_id, candidates = _resolve_title(snapshot, title)
+        if row_id is None:
+            return None, None, _candidate_list(df, candidates)
+        project = df.iloc[row_id]
+        ids, scores = snapshot.similar.neighbors(row_id, limit)
+        neighbors = df.iloc[ids]
+
+    info = _comparison_info(project)
+    similar = render.records(
+        neighbors, ["title", "student", "specialty"],
+        similarity_score=[int(score) for score in scores.tolist()],
+        common_technologies=[[t for t in techs if t in info["technologies"]]
+                             for techs in neighbors["technologies"].tolist()],
+    )
+    return info, similar, []
+
+# ============================================
+# PROFILE RECOMMENDATION
+# ============================================
+
+LEVEL_BONUS = 1.0
+INTERMEDIATE_BONUS = 0.5
+DOMAIN_MATCH_SCORE = 3.0
+
+@metrics.timed("score_profile")
+def score_profile(profile_domains, level, k=5):
+    """Score every project against a profile with one matrix product.
+
+    Returns (top k projects, their scores, number of projects scoring > 0).
+    """
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None
+    if STORAGE == "sqlite":
+        complex_bonus, simple_bonus = {
+            "beginner": (0.0, LEVEL_BONUS),
+            "advanced": (LEVEL_BONUS, 0.0),
+            "intermediate": (INTERMEDIATE_BONUS, INTERMEDIATE_BONUS),
+        }.get(level, (0.0, 0.0))
+        domains = [d for d in taxonomy.DOMAINS if d in profile_domains]
+        return snapshot.score_profile(domains, DOMAIN_MATCH_SCORE, complex_bonus, simple_bonus, k)
+    df = snapshot.df
+
+    weights = np.array([DOMAIN_MATCH_SCORE if d in profile_domains else 0.0 for d in taxonomy.DOMAINS],
+                       dtype=np.float32)
+    scores = snapshot.domain_matrix @ weights
+
+    is_complex = df['is_complex'].to_numpy()
+    if level == "beginner":
+        scores += np.where(is_complex, 0.0, LEVEL_BONUS)
+    elif level == "advanced":
+        scores += np.where(is_complex, LEVEL_BONUS, 0.0)
+    elif level == "intermediate":
+        scores += INTERMEDIATE_BONUS
+
+    total = int(np.count_nonzero(scores > 0))
+    top = top_k(scores, min(k, total))
+    return df.iloc[top], scores[top], total
 
 # ============================================
 # ORIGINAL SEARCH FUNCTION
 # ============================================
 
-def search_pfe(query: str) -> str:
-    df = load_data()
-    if df is None:
-        return "Database unavailable."
+# Retrieval limits for the LLM prompt (about 4 characters per token)
+RETRIEVAL_TOP_K = int(os.getenv("PFE_RETRIEVAL_TOP_K", "25"))
+RETRIEVAL_CHAR_BUDGET = int(os.getenv("PFE_RETRIEVAL_CHAR_BUDGET", "4000"))
+
+# "keyword" (taxonomy + BM25) or "semantic" (TF-IDF cosine) retrieval by default
+SEARCH_MODES = ("keyword", "semantic") if STORAGE == "memory" else ("keyword",)
+SEARCH_MODE = os.getenv("PFE_SEARCH_MODE", "keyword")
+if SEARCH_MODE not in SEARCH_MODES:
+    raise ValueError(f"PFE_SEARCH_MODE must be one of {', '.join(SEARCH_MODES)} with PFE_STORAGE={STORAGE}, "
+                     f"not {SEARCH_MODE!r}")
+
+# Cosine similarity below which a project is not a semantic match
+SEMANTIC_MIN_SCORE = float(os.getenv("PFE_SEMANTIC_MIN_SCORE", "0.2"))
+
+RANK_FIELDS = ("title", "specialty", "student")
+
+def query_terms(text):
+    """Meaningful words of a question, stopwords removed"""
+    return [t for t in tokenize(text) if t not in taxonomy.STOPWORDS]
+
+@metrics.timed("search_ranked")
+def search_ranked(query, domain=None, terms=None, fields=("title", "specialty"), limit=None, offset=0):
+    """Projects of a domain, or matching any of terms, ordered by BM25 relevance to query.
+
+    Returns (`limit` projects from rank `offset` on as a DataFrame, total
+    number of matches).
+    """
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None, 0
+    if STORAGE == "sqlite":
+        # FTS5 prefix matches ranked by its bm25() with the same field weights
+        match_terms = None if domain is not None else [
+            tokenize(term) for term in (terms if terms is not None else query_terms(query))]
+        return snapshot.search(query_terms(query), domain, match_terms, fields, limit, offset)
+    if domain is not None:
+        rows = snapshot.domain_rows[domain]
+    else:
+        rows = snapshot.index.match_any(terms if terms is not None else query_terms(query), fields)
+    ranked = snapshot.ranker.rank(query, rows, limit=limit, fields=RANK_FIELDS, stopwords=taxonomy.STOPWORDS,
+                                  offset=offset)
+    return snapshot.df.iloc[ranked], len(rows)
+
+@metrics.timed("search_semantic")
+def search_semantic(query, limit=None, offset=0):
+    """Projects closest to query in TF-IDF space, best first.
+
+    Returns (`limit` projects from rank `offset` on, their cosine scores,
+    number of projects scoring at least SEMANTIC_MIN_SCORE).
+    """
+    if STORAGE != "memory":
+        raise ValueError("Semantic search needs PFE_STORAGE=memory")
+    snapshot = get_snapshot()
+    if snapshot is None:
+        return None, None, 0
+    scores = snapshot.semantic.scores(query)
+    total = int(np.count_nonzero(scores >= SEMANTIC_MIN_SCORE))
+    top = top_k(scores, total if limit is None else min(offset + limit, total))[offset:]
+    return snapshot.df.iloc[top], scores[top], total
+
+@metrics.timed("retrieve")
+def retrieve(query, top_k=None, char_budget=None, mode=None):
+    """Ranked project lines for a query, cut to top_k rows and a character budget.
+
+    Returns {"text", "shown", "total", "truncated"} where truncated is the
+    number of matching projects left out of the text.
+    """
+    top_k = RETRIEVAL_TOP_K if top_k is None else top_k
+    char_budget = RETRIEVAL_CHAR_BUDGET if char_budget is None else char_budget
+    mode = SEARCH_MODE if mode is None else mode
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    if get_snapshot() is None:
+        return {"text": "Database unavailable.", "shown": 0, "total": 0, "truncated": 0}
 
     q = query.lower()
-    results = []
-
-    # Domain synonyms dictionary
-    domain_synonyms = {
-        "ai": ["ai", "ia", "intelligence artificielle", "artificial intelligence", "machine learning", "deep learning"],
-        "blockchain": ["blockchain", "iota", "crypto", "dlc"],
-        "cybersecurity": ["cybersecurity", "cyber security", "cybersécurité", "cyber-sécurité", "sécurité informatique", "security"],
-        "network security": ["network security", "sécurité réseau", "networking"],
-        "web": ["web", "web development", "développement web"],
-        "iot": ["iot", "internet of things", "iota"],
-        "automation": ["automation", "automatisation", "process optimization"],
-        "mobile networks": ["mobile networks", "4g", "5g", "mobile"],
-        "image processing": ["image processing", "computer vision", "cv"],
-        "software quality": ["quality", "software quality", "testing", "qa"],
-    }
+    domains = taxonomy.domains(q)
+    if mode == "semantic":
+        # Nearest projects by meaning, also for paraphrases the keyword lists miss
+        projects, _, total = search_semantic(q, limit=top_k)
+        header = "**Closest projects:**"
+        empty = "No similar projects found."
+    elif domains:
+        # Check by domain
+        domain = domains[0]
+        projects, total = search_ranked(q, domain=domain, limit=top_k)
+        header = f"**{taxonomy.domain_label(domain)} projects:**"
+        empty = f"No {domain} projects found."
+    else:
+        # Fallback: projects containing any of the meaningful query words
+        projects, total = search_ranked(q, limit=top_k)
+        header = "**Matching projects:**"
+        empty = "No matching projects found."
+
+    if total == 0:
+        return {"text": empty, "shown": 0, "total": 0, "truncated": 0}
 
-    # Check by domain
-    matched = False
-    for domain, synonyms in domain_synonyms.items():
-        if any(k in q for k in synonyms):
-            mask = df['title_lower'].str.contains('|'.join(synonyms), case=False, na=False) | \
-                   df['specialty_lower'].str.contains('|'.join(synonyms), case=False, na=False)
-            projects = df[mask]
-            if not projects.empty:
-                results.append(f"**{domain.capitalize()} projects:**")
-                for _, row in projects.iterrows():
-                    results.append(f"• **{row['student']}** – {row['title']} ({row['specialty']})")
-            else:
-                results.append(f"No {domain} projects found.")
-            matched = True
+    results = [header]
+    used = len(header)
+    shown = 0
+    for line in render.bullet_lines(projects):
+        if shown and used + len(line) + 1 > char_budget:
             break
+        results.append(line)
+        used += len(line) + 1
+        shown += 1
 
-    # Fallback: full scan
-    if not matched:
-        mask = df['title_lower'].str.contains(q, case=False, na=False) | \
-               df['specialty_lower'].str.contains(q, case=False, na=False)
-        projects = df[mask]
-        if not projects.empty:
-            results.append("**Matching projects:**")
-            for _, row in projects.iterrows():
-                results.append(f"• **{row['student']}** – {row['title']} ({row['specialty']})")
-        else:
-            results.append("No matching projects found.")
+    truncated = total - shown
+    if truncated:
+        results.append(f"(… {truncated} more matching project(s) not shown)")
+    return {"text": "\n".join(results), "shown": shown, "total": total, "truncated": truncated}
+
+def search_pfe(query: str, top_k=None, char_budget=None, mode=None) -> str:
+    """Most relevant projects for a query as text, bounded for use in an LLM prompt"""
+    return retrieve(query, top_k, char_budget, mode)["text"]
 
-    return "\n".join(results) if results else "No relevant information found."
\ No newline at end of file
+def __getattr__(name):
+    # PFESearchTool needs crewai, so it is only imported when the crew asks for it
+    if name == "PFESearchTool":
+        from .pfe_search_tool import PFESearchTool
+        return PFESearchTool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
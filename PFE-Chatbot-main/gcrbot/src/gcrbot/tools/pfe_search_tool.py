@@ -0,0 +1,40 @@
+# src/gcrbot/tools/pfe_search_tool.py
+from collections import OrderedDict
+from typing import Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .db_tool import dataset_version, search_pfe
+
+
+class PFESearchToolInput(BaseModel):
+    """Input schema for PFESearchTool."""
+    query: str = Field(..., description="Question ou mots-clés à chercher dans les PFE (domaine, technologie, étudiant).")
+
+class PFESearchTool(BaseTool):
+    name: str = "Recherche PFE"
+    description: str = (
+        "Cherche dans la base des projets de fin d'études et renvoie les projets les plus pertinents "
+        "(étudiant, titre, spécialité), avec le nombre de résultats non affichés."
+    )
+    args_schema: Type[BaseModel] = PFESearchToolInput
+
+    # Output bounds, so a broad query cannot flood the agent's context
+    top_k: int = 15
+    char_budget: int = 2000
+    # Results already computed in this session, keyed by dataset version and query
+    memo_size: int = 128
+    _memo: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+
+    def _run(self, query: str) -> str:
+        key = (dataset_version(), " ".join(query.lower().split()))
+        result = self._memo.get(key)
+        if result is None:
+            result = search_pfe(query, top_k=self.top_k, char_budget=self.char_budget)
+            self._memo[key] = result
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(key)
+        return result
@@ -0,0 +1,97 @@
+# src/gcrbot/tools/ranking.py
+from bisect import bisect_left
+
+import numpy as np
+
+from .search_index import tokenize
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# How much a match in each field counts towards the score
+FIELD_WEIGHTS = {"title": 1.0, "specialty": 0.7, "student": 0.5}
+
+# Words that only share the query word as a prefix ("network" -> "networking")
+PREFIX_WEIGHT = 0.5
+
+
+def bm25_weights(index, k1=K1, b=B):
+    """Per-posting BM25 weights, aligned with each field's ids array.
+
+    Document frequencies, lengths and the length normalisation are all
+    folded in here at load time, so a query only sums slices.
+    """
+    weights = {}
+    for field, (vocab, offsets, ids) in index.tables.items():
+        tfs, lengths = index.stats[field]
+        n_docs = len(lengths)
+        avg_length = max(float(lengths.mean()), 1.0) if n_docs else 1.0
+        doc_freq = np.diff(offsets)
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = k1 * (1 - b + b * lengths[ids] / avg_length)
+        weights[field] = (np.repeat(idf, doc_freq) * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+    return weights
+
+
+def top_k(scores, k):
+    """Indices of the k best scores, best first, ties kept in index order"""
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    rows = np.concatenate([above, ties])
+    return rows[np.lexsort((rows, -scores[rows]))]
+
+
+class BM25Ranker:
+    """BM25 relevance over the fields of an InvertedIndex"""
+
+    def __init__(self, index, weights, field_weights=FIELD_WEIGHTS):
+        self.index = index
+        self.weights = weights
+        self.field_weights = field_weights
+
+    def score(self, query, fields=("title", "specialty", "student"), stopwords=()):
+        """(rows, scores) of every row with a positive score, rows sorted"""
+        row_parts = []
+        score_parts = []
+        for token in set(tokenize(query)) - set(stopwords):
+            for field in fields:
+                vocab, offsets, ids = self.index.tables[field]
+                start = bisect_left(vocab, token)
+                end = bisect_left(vocab, token + "\U0010ffff", lo=start)
+                if start == end:
+                    continue
+                lo, hi = offsets[start], offsets[end]
+                contrib = self.weights[field][lo:hi] * self.field_weights.get(field, 1.0)
+                if vocab[start] == token:
+                    contrib[offsets[start + 1] - lo:] *= PREFIX_WEIGHT
+                else:
+                    contrib *= PREFIX_WEIGHT
+                row_parts.append(ids[lo:hi])
+                score_parts.append(contrib)
+
+        if not row_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        rows, inverse = np.unique(np.concatenate(row_parts), return_inverse=True)
+        return rows, np.bincount(inverse, weights=np.concatenate(score_parts))
+
+    def rank(self, query, candidates, limit=None, fields=("title", "specialty", "student"), stopwords=(), offset=0):
+        """Candidate rows (sorted ids) ordered by score, best first.
+
+        Candidates without a score keep their file order after the scored
+        ones; only the first `offset + limit` rows are selected and sorted,
+        and the first `offset` of them skipped (one page of the ranking).
+        """
+        candidates = np.asarray(candidates)
+        end = len(candidates) if limit is None else min(offset + limit, len(candidates))
+        scores = np.zeros(len(candidates))
+        rows, row_scores = self.score(query, fields, stopwords)
+        if len(rows):
+            pos = np.searchsorted(rows, candidates)
+            pos[pos == len(rows)] = 0
+            hit = rows[pos] == candidates
+            scores[hit] = row_scores[pos[hit]]
+        return candidates[top_k(scores, end)[offset:]]
@@ -0,0 +1,64 @@
+# src/gcrbot/tools/render.py
+"""Bulk formatting of project result sets.
+
+Every function reads whole columns once (Series.tolist()) and builds the
+output in a single comprehension. Nothing is boxed per row the way
+DataFrame.iterrows() boxes each row into a Series, so a page of results
+costs a few string operations per project.
+"""
+from itertools import count
+
+import pandas as pd
+
+RECORD_COLUMNS = ["student", "title", "specialty", "supervisor", "year"]
+
+
+def _years(column):
+    """Year column as Python ints, None where missing"""
+    return [int(y) if pd.notna(y) else None for y in column.tolist()]
+
+
+def _texts(column):
+    """Column as strings, None where missing (NaN from the CSV, None from SQLite)"""
+    return [str(v) if pd.notna(v) else None for v in column.tolist()]
+
+
+def project_blocks(projects, start=1, label="Year", values=None):
+    """Numbered Markdown blocks (student, title, specialty, then label: value) of the /predict answers.
+
+    values defaults to the year column; pass already formatted strings for
+    anything else (e.g. similarity percentages).
+    """
+    values = projects['year'].tolist() if values is None else values
+    return [
+        f"{i}. **Student:** {student}\n   **Title:** {title}\n   **Specialty:** {specialty}\n   **{label}:** {value}\n"
+        for i, student, title, specialty, value in zip(count(start), projects['student'].tolist(),
+                                                       projects['title'].tolist(), projects['specialty'].tolist(),
+                                                       values)
+    ]
+
+
+def project_lines(projects, start=1):
+    """Numbered one-line entries: "1. STUDENT - Title (Specialty)" """
+    return [
+        f"{i}. {student} - {title} ({specialty})"
+        for i, student, title, specialty in zip(count(start), projects['student'].tolist(),
+                                                projects['title'].tolist(), projects['specialty'].tolist())
+    ]
+
+
+def bullet_lines(projects):
+    """Bulleted entries for LLM prompts: "• **STUDENT** – Title (Specialty)" """
+    return [
+        f"• **{student}** – {title} ({specialty})"
+        for student, title, specialty in zip(projects['student'].tolist(), projects['title'].tolist(),
+                                             projects['specialty'].tolist())
+    ]
+
+
+def records(projects, columns=RECORD_COLUMNS, **extra):
+    """JSON-ready dicts of the given columns; extra name=list pairs add per-row fields"""
+    data = {col: _years(projects[col]) if col == "year" else _texts(projects[col]) for col in columns}
+    data.update(extra)
+    names = list(data)
+    return [dict(zip(names, values)) for values in zip(*data.values())]
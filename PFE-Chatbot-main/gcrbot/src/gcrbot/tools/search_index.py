@@ -0,0 +1,98 @@
+# src/gcrbot/tools/search_index.py
+import re
+from bisect import bisect_left
+from collections import Counter
+from functools import reduce
+from itertools import chain
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens (accents are kept)"""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def union(arrays):
+    """Sorted union of row id arrays"""
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return _EMPTY
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+def intersect(arrays):
+    """Sorted intersection of row id arrays"""
+    if not arrays:
+        return _EMPTY
+    return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), arrays)
+
+
+class InvertedIndex:
+    """Token -> sorted row ids, with one posting table per indexed column.
+
+    Terms are matched as word prefixes ("cyber" finds "cybersecurity",
+    "network" finds "networking") and multi-word terms require every word
+    to appear in the same field, which keeps the behaviour of the old
+    substring scans without touching the whole DataFrame on each request.
+
+    Each table is stored CSR-style as (sorted vocab, offsets, ids): the
+    postings of vocab[i] are ids[offsets[i]:offsets[i + 1]]. The two arrays
+    can be memory-mapped straight from a snapshot file.
+    """
+
+    def __init__(self, tables, stats=None):
+        self.tables = tables
+        # Only set by from_columns: {field: (term frequencies aligned with ids, tokens per row)}
+        self.stats = stats
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build the index from {field: iterable of strings}"""
+        tables = {}
+        stats = {}
+        for field, values in columns.items():
+            postings = {}
+            lengths = []
+            for row_id, text in enumerate(values):
+                tokens = tokenize(text)
+                lengths.append(len(tokens))
+                for token, tf in Counter(tokens).items():
+                    postings.setdefault(token, []).append((row_id, tf))
+            vocab = sorted(postings)
+            offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+            np.cumsum([len(postings[t]) for t in vocab], out=offsets[1:])
+            pairs = np.fromiter(chain.from_iterable(chain.from_iterable(postings[t] for t in vocab)),
+                                dtype=np.int32, count=2 * offsets[-1])
+            tables[field] = (vocab, offsets, pairs[0::2].copy())
+            stats[field] = (pairs[1::2].copy(), np.asarray(lengths, dtype=np.int32))
+        return cls(tables, stats)
+
+    def lookup(self, field, token):
+        """Rows of a field containing a word starting with token"""
+        vocab, offsets, ids = self.tables[field]
+        # Every word with this prefix sits in one contiguous run of the sorted vocab
+        start = bisect_left(vocab, token)
+        end = bisect_left(vocab, token + "\U0010ffff", lo=start)
+        if start == end:
+            return _EMPTY
+        rows = ids[offsets[start]:offsets[end]]
+        return rows if end - start == 1 else np.unique(rows)
+
+    def match_term(self, term, fields):
+        """Rows where one of the fields contains every word of term"""
+        tokens = tokenize(term)
+        if not tokens:
+            return _EMPTY
+        return union([intersect([self.lookup(field, t) for t in tokens]) for field in fields])
+
+    def match_any(self, terms, fields):
+        """Rows matching at least one of the terms, in file order"""
+        return union([self.match_term(term, fields) for term in terms])
@@ -0,0 +1,105 @@
+# src/gcrbot/tools/semantic.py
+import unicodedata
+import zlib
+
+import numpy as np
+
+from . import taxonomy
+from .search_index import TOKEN_RE
+
+# Character n-gram sizes, taken inside word boundaries (" rés", "seau ")
+CHAR_NGRAMS = (3, 4)
+
+# Weight of the taxonomy domain features, which bridge FR and EN wording
+# ("réseaux" and "networking" both tag the network domain)
+DOMAIN_WEIGHT = 2.0
+
+# Rows are vectorised in chunks to bound the temporary count matrix
+CHUNK_ROWS = 20000
+
+
+def _fold(text):
+    """Lowercase and strip accents, so "sécurité" and "securite" share n-grams"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+# Stopwords, accent-folded like the text they are compared with
+STOPWORDS = frozenset(TOKEN_RE.findall(_fold(" ".join(taxonomy.STOPWORDS))))
+
+
+def word_features(word):
+    """A word and its character n-grams, after accent folding"""
+    padded = f" {word} "
+    return ["w:" + word] + ["c:" + padded[i:i + n] for n in CHAR_NGRAMS for i in range(len(padded) - n + 1)]
+
+
+class SemanticIndex:
+    """TF-IDF vectors of every project in one dense float32 matrix.
+
+    Features are hashed into `dim` buckets so the matrix size is fixed
+    (rows x dim x 4 bytes) whatever the vocabulary. Rows are L2-normalised,
+    so a query is one matrix-vector product followed by a top-k.
+    """
+
+    def __init__(self, matrix, idf):
+        self.matrix = matrix
+        self.idf = idf
+        self.dim = len(idf)
+        self._word_buckets = {}
+
+    def _bucket(self, feature):
+        return zlib.crc32(feature.encode("utf-8")) % self.dim
+
+    def _buckets(self, word):
+        """Hashed features of a lowercase word, memoised since words repeat across titles"""
+        buckets = self._word_buckets.get(word)
+        if buckets is None:
+            folded = _fold(word)
+            buckets = [] if folded in STOPWORDS else [self._bucket(f) for f in word_features(folded)]
+            self._word_buckets[word] = buckets
+        return buckets
+
+    def _counts(self, docs):
+        """Weighted feature counts of (text, domains) pairs as a len(docs) x dim matrix"""
+        flat = []
+        domain_flat = []
+        for row_id, (text, domains) in enumerate(docs):
+            base = row_id * self.dim
+            if isinstance(text, str):
+                for word in TOKEN_RE.findall(text.lower()):
+                    flat.extend(base + b for b in self._buckets(word))
+            domain_flat.extend(base + self._bucket("d:" + d) for d in domains)
+        size = len(docs) * self.dim
+        counts = np.bincount(np.asarray(flat, dtype=np.int64), minlength=size).astype(np.float32)
+        if domain_flat:
+            counts += DOMAIN_WEIGHT * np.bincount(np.asarray(domain_flat, dtype=np.int64), minlength=size)
+        return counts.reshape(len(docs), self.dim)
+
+    @classmethod
+    def from_texts(cls, texts, domains, dim=512):
+        """Build from project texts and their taxonomy domains"""
+        index = cls(np.zeros((0, dim), dtype=np.float32), np.ones(dim, dtype=np.float32))
+        docs = list(zip(texts, domains))
+        matrix = np.zeros((len(docs), dim), dtype=np.float32)
+        for start in range(0, len(docs), CHUNK_ROWS):
+            chunk = docs[start:start + CHUNK_ROWS]
+            matrix[start:start + len(chunk)] = np.log1p(index._counts(chunk))
+
+        doc_freq = np.count_nonzero(matrix, axis=0)
+        index.idf = (np.log((1 + len(docs)) / (1 + doc_freq)) + 1).astype(np.float32)
+        matrix *= index.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        index.matrix = matrix
+        return index
+
+    def query_vector(self, text):
+        """Normalised TF-IDF vector of a free-text query"""
+        vector = np.log1p(self._counts([(text, taxonomy.domains(text))])[0]) * self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def scores(self, text):
+        """Cosine similarity of the query with every project"""
+        return self.matrix @ self.query_vector(text)
@@ -0,0 +1,130 @@
+# src/gcrbot/tools/similarity.py
+import numpy as np
+
+# Signatures scored against each other per block, to bound the temporary matrix
+BLOCK = 512
+
+
+class SimilarityGraph:
+    """Top-k most similar projects of every project.
+
+    ids[row] lists the neighbours of row, best first (-1 pads rows with
+    fewer than k), scores[row] their similarity scores.
+    """
+
+    def __init__(self, ids, scores):
+        self.ids = ids
+        self.scores = scores
+
+    def neighbors(self, row, limit=None):
+        """(ids, scores) of the nearest projects of row"""
+        ids = self.ids[row]
+        keep = np.flatnonzero(ids >= 0)[:limit]
+        return ids[keep], self.scores[row][keep]
+
+    @classmethod
+    def build(cls, technologies, specialty, complexity, duration, points, cap, k):
+        """Score every pair of projects the way calculate_similarity_score() does.
+
+        The score only depends on a project's (technology set, specialty,
+        complexity, duration) signature, and few distinct signatures exist,
+        so whole groups of identical projects are scored at once.
+        """
+        n = len(specialty)
+        keys = list(zip(map(frozenset, technologies), specialty, complexity, duration))
+        signatures = list(dict.fromkeys(keys))
+        position = {sig: i for i, sig in enumerate(signatures)}
+        group = np.fromiter((position[key] for key in keys), dtype=np.int64, count=n)
+
+        # Members of each signature group, in file order
+        order = np.argsort(group, kind="stable")
+        bounds = np.searchsorted(group[order], np.arange(len(signatures) + 1))
+        members = [order[bounds[s]:bounds[s + 1]] for s in range(len(signatures))]
+        groups = (order, bounds[:-1], np.diff(bounds))
+
+        techs = sorted(set().union(*(sig[0] for sig in signatures)))
+        tech_matrix = np.array([[t in sig[0] for t in techs] for sig in signatures], dtype=np.float32)
+        codes = {}
+        for field in (1, 2, 3):
+            _, codes[field] = np.unique(np.array([sig[field] for sig in signatures], dtype=object).astype(str),
+                                        return_inverse=True)
+
+        ids = np.full((n, k), -1, dtype=np.int32)
+        scores = np.zeros((n, k), dtype=np.float32)
+        if n == 0 or k == 0:
+            return cls(ids, scores)
+
+        for start in range(0, len(signatures), BLOCK):
+            block = slice(start, min(start + BLOCK, len(signatures)))
+            block_scores = (tech_matrix[block] @ tech_matrix.T) * points["technology"]
+            block_scores += (codes[1][block, None] == codes[1][None, :]) * points["specialty"]
+            block_scores += (codes[2][block, None] == codes[2][None, :]) * points["complexity"]
+            block_scores += (codes[3][block, None] == codes[3][None, :]) * points["duration"]
+            np.minimum(block_scores, cap, out=block_scores)
+
+            for offset, row_scores in enumerate(block_scores):
+                s = start + offset
+                # k + 1 best projects for the group; each member then drops itself
+                best = cls._best(row_scores, groups, k + 1)
+                if len(best[0]) == 0:
+                    continue
+                cls._fill(ids, scores, members[s], best, k)
+        return cls(ids, scores)
+
+    @staticmethod
+    def _best(group_scores, groups, count):
+        """(rows, scores) of the best `count` projects, ties in file order, positive scores only.
+
+        groups is (order, starts, sizes): the members of group g are
+        order[starts[g]:starts[g] + sizes[g]], in file order.
+        """
+        order, starts, sizes = groups
+        # The count best groups already hold count projects, so weaker groups never make the list
+        floor = np.partition(group_scores, len(group_scores) - count)[len(group_scores) - count] \
+            if len(group_scores) > count else 0
+        ranked = np.flatnonzero(group_scores >= max(floor, np.finfo(np.float32).tiny))
+        ranked = ranked[np.argsort(-group_scores[ranked], kind="stable")]
+        reached = np.searchsorted(np.cumsum(sizes[ranked]), count)
+        if reached == len(ranked):
+            above, tied = ranked, ranked[:0]
+        else:
+            # Groups above the last one needed fit entirely; ties with it compete on file order
+            cutoff = group_scores[ranked[reached]]
+            above, tied = ranked[group_scores[ranked] > cutoff], ranked[group_scores[ranked] == cutoff]
+
+        rows = _members(order, starts, sizes, above, count)
+        row_scores = np.repeat(group_scores[above], np.minimum(sizes[above], count))
+        if len(tied):
+            remaining = count - len(rows)
+            tied_rows = _members(order, starts, sizes, tied, remaining)
+            if len(tied_rows) > remaining:
+                tied_rows = np.partition(tied_rows, remaining - 1)[:remaining]
+            rows = np.concatenate([rows, tied_rows])
+            row_scores = np.concatenate([row_scores, np.full(len(tied_rows), group_scores[tied[0]])])
+        top = np.lexsort((rows, -row_scores))[:count]
+        return rows[top], row_scores[top]
+
+    @staticmethod
+    def _fill(ids, scores, group_members, best, k):
+        """Write the neighbour rows of one signature group, leaving each project out of its own list"""
+        best_rows, best_scores = best
+        width = min(k, len(best_rows))
+        in_best = np.isin(group_members, best_rows)
+
+        # Members not in the list share its first k entries
+        outside = group_members[~in_best]
+        ids[outside, :width] = best_rows[:width]
+        scores[outside, :width] = best_scores[:width]
+
+        for row in group_members[in_best]:
+            keep = best_rows != row
+            own = best_rows[keep][:k]
+            ids[row, :len(own)] = own
+            scores[row, :len(own)] = best_scores[keep][:k]
+
+
+def _members(order, starts, sizes, selected, count):
+    """The first `count` members of each selected group, concatenated"""
+    take = np.minimum(sizes[selected], count)
+    offsets = np.cumsum(take) - take
+    return order[np.arange(take.sum()) + np.repeat(starts[selected] - offsets, take)]
@@ -0,0 +1,140 @@
+# src/gcrbot/tools/snapshot_file.py
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# File layout:
+#   MAGIC | u64 header length | JSON header | padding | sections
+# Every section is a numpy array, 64-byte aligned so it can be memory-mapped
+# in place. Documents (vocabularies, tables of distinct values) are sections
+# of UTF-8 JSON. Nothing in the file is executable: no pickle.
+MAGIC = b"PFESNAP2"
+ALIGN = 64
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_snapshot_file(path, meta, arrays, documents):
+    """Write meta (JSON), numpy arrays and JSON documents to path, atomically"""
+    path = Path(path)
+    sections = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    for name, document in documents.items():
+        sections[name] = np.frombuffer(json.dumps(document, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+    layout = {}
+    offset = 0
+    for name, array in sections.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset,
+                        "json": name in documents}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({"meta": meta, "sections": layout}).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, array in sections.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+
+
+def read_snapshot_meta(path):
+    """Header of a snapshot file, or None if it is missing or not a snapshot"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(length))
+    except (OSError, ValueError, struct.error):
+        return None
+    header["data_start"] = _align(len(MAGIC) + 8 + length)
+    return header
+
+
+def read_snapshot_file(path, header=None):
+    """Return (meta, arrays, documents); arrays are read-only memory maps"""
+    header = header or read_snapshot_meta(path)
+    if header is None:
+        raise ValueError(f"Not a snapshot file: {path}")
+    data_start = header["data_start"]
+
+    arrays, documents = {}, {}
+    for name, spec in header["sections"].items():
+        shape = tuple(spec["shape"])
+        if 0 in shape:
+            array = np.empty(shape, dtype=spec["dtype"])
+        else:
+            # ndarray view of the map: slicing a np.memmap subclass is slower
+            array = np.asarray(np.memmap(path, dtype=spec["dtype"], mode="r", shape=shape,
+                                         offset=data_start + spec["offset"]))
+        if spec["json"]:
+            documents[name] = json.loads(array.tobytes().decode("utf-8"))
+        else:
+            arrays[name] = array
+    return header["meta"], arrays, documents
+
+
+# ============================================
+# DATAFRAME COLUMNS
+# ============================================
+# Numeric and boolean columns are stored as raw arrays. Any other column
+# (text, lists of tags) is dictionary-encoded: int32 codes per row plus a
+# JSON document of its distinct values, so decoding costs one JSON parse
+# and one array gather per column.
+
+def encode_frame(df, prefix):
+    """(spec, arrays, documents) storing the columns of df under prefix"""
+    spec, arrays, documents = [], {}, {}
+    for i, column in enumerate(df.columns):
+        name = f"{prefix}.{i}"
+        values = df[column]
+        if values.dtype.kind in "biuf":
+            arrays[name] = values.to_numpy()
+            spec.append({"name": column, "dtype": str(values.dtype), "encoding": "array"})
+            continue
+        codes = {}
+        table = []
+        keys = np.empty(len(values), dtype=np.int32)
+        for row, value in enumerate(values.tolist()):
+            if isinstance(value, list):
+                key = (list, *value)
+            elif pd.isna(value):
+                key, value = None, None
+            else:
+                key = value
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(table)
+                table.append(value)
+            keys[row] = code
+        arrays[f"{name}.codes"] = keys
+        documents[f"{name}.values"] = table
+        spec.append({"name": column, "dtype": str(values.dtype), "encoding": "dictionary"})
+    return spec, arrays, documents
+
+
+def decode_frame(spec, arrays, documents, prefix):
+    """DataFrame stored by encode_frame(); equal rows share one list object"""
+    columns = {}
+    for i, column in enumerate(spec):
+        name = f"{prefix}.{i}"
+        if column["encoding"] == "array":
+            columns[column["name"]] = pd.Series(arrays[name], dtype=column["dtype"], copy=False)
+            continue
+        table = documents[f"{name}.values"]
+        distinct = np.empty(len(table), dtype=object)
+        for code, value in enumerate(table):
+            distinct[code] = value
+        columns[column["name"]] = pd.Series(distinct[arrays[f"{name}.codes"]], dtype=column["dtype"])
+    return pd.DataFrame(columns)
@@ -0,0 +1,379 @@
+# src/gcrbot/tools/sqlite_store.py
+"""SQLite storage for the project catalogue (PFE_STORAGE=sqlite).
+
+The CSV is imported chunk by chunk into one database file: a projects table
+holding the enriched columns, with indexes on year, specialty, student,
+lowercased title and is_complex, a (domain, project) table for the taxonomy tags,
+the similarity signatures of the projects (see similar()) and an FTS5 index
+over title, specialty and student. Queries read only the pages
+they touch, so memory use stays flat as the catalogue grows. A database is
+never modified once built: a new CSV version is imported into a new file that
+replaces the old one.
+"""
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .ranking import FIELD_WEIGHTS
+
+STORE_FORMAT = 2
+
+# CSV rows read and enriched at a time during an import
+IMPORT_CHUNK_ROWS = 50_000
+
+# Enriched columns holding lists, stored as JSON text
+LIST_COLUMNS = ("domains", "technologies", "tools_required")
+PROJECT_COLUMNS = ("student", "title", "specialty", "supervisor", "year", "title_lower", "duration", "complexity",
+                   "value_added", "required_skills", "is_complex") + LIST_COLUMNS
+
+# Full-text columns, in the order bm25() takes their weights
+FTS_FIELDS = ("title", "specialty", "student")
+
+# Columns value_counts() may group by
+COUNT_COLUMNS = ("specialty", "year", "student")
+
+SCHEMA = f"""
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY,  -- row number in the CSV
+    student TEXT, title TEXT, specialty TEXT, supervisor TEXT, year INTEGER, title_lower TEXT,
+    duration TEXT, complexity TEXT, value_added TEXT, required_skills TEXT, is_complex INTEGER,
+    domains TEXT, technologies TEXT, tools_required TEXT
+);
+CREATE TABLE project_domains (
+    domain TEXT, project_id INTEGER, PRIMARY KEY (domain, project_id)
+) WITHOUT ROWID;
+-- Distinct (technology set, specialty, complexity, duration) of the projects, which decide their similarity
+CREATE TABLE signatures (id INTEGER PRIMARY KEY, specialty TEXT, complexity TEXT, duration TEXT, size INTEGER);
+CREATE TABLE signature_technologies (
+    technology TEXT, signature_id INTEGER, PRIMARY KEY (technology, signature_id)
+) WITHOUT ROWID;
+CREATE TABLE project_signatures (
+    signature_id INTEGER, project_id INTEGER, PRIMARY KEY (signature_id, project_id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE projects_fts USING fts5(
+    {", ".join(FTS_FIELDS)}, content='projects', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 0', prefix='2 3'
+);
+"""
+
+# Built after the bulk insert, which is faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX projects_year ON projects (year);
+CREATE INDEX projects_specialty ON projects (specialty);
+CREATE INDEX projects_student ON projects (student);
+CREATE INDEX projects_title ON projects (title_lower);
+CREATE INDEX projects_complex ON projects (is_complex);
+INSERT INTO projects_fts (projects_fts) VALUES ('rebuild');
+ANALYZE;
+"""
+
+
+def _text(values):
+    return [None if pd.isna(v) else str(v) for v in values]
+
+
+def _rows(chunk, first_id):
+    """Insert parameters of one enriched chunk, column by column"""
+    columns = [
+        _text(chunk['student']), _text(chunk['title']), _text(chunk['specialty']), _text(chunk['supervisor']),
+        [int(y) if pd.notna(y) else None for y in chunk['year'].tolist()],
+        _text(chunk['title_lower']), chunk['duration'].tolist(), chunk['complexity'].tolist(),
+        chunk['value_added'].tolist(), chunk['required_skills'].tolist(),
+        [int(bool(v)) for v in chunk['is_complex'].tolist()],
+    ]
+    columns += [[json.dumps(v) for v in chunk[col].tolist()] for col in LIST_COLUMNS]
+    return zip(range(first_id, first_id + len(chunk)), *columns)
+
+
+def _signature_ids(chunk, signatures):
+    """Signature id of each project of a chunk, numbering new signatures in signatures {key: [id, size]}"""
+    ids = []
+    for key in zip(map(frozenset, chunk['technologies'].tolist()), _text(chunk['specialty']),
+                   chunk['complexity'].tolist(), chunk['duration'].tolist()):
+        entry = signatures.get(key)
+        if entry is None:
+            entry = signatures[key] = [len(signatures), 0]
+        entry[1] += 1
+        ids.append(entry[0])
+    return ids
+
+
+def build(csv_path, db_path, prepare, meta):
+    """Import csv_path into a new database at db_path, replacing it atomically.
+
+    prepare(chunk) adds the enriched columns to each DataFrame chunk; meta is
+    stored in the meta table, with the row and complex project counts added.
+    """
+    db_path = Path(db_path)
+    tmp = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    placeholders = ", ".join("?" * (len(PROJECT_COLUMNS) + 1))
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        rows = complex_rows = 0
+        signatures = {}
+        for chunk in pd.read_csv(csv_path, chunksize=IMPORT_CHUNK_ROWS):
+            chunk = chunk.reset_index(drop=True)
+            chunk['title_lower'] = chunk['title'].str.lower()
+            prepare(chunk)
+            conn.executemany(f"INSERT INTO projects (id, {', '.join(PROJECT_COLUMNS)}) VALUES ({placeholders})",
+                             _rows(chunk, rows))
+            conn.executemany("INSERT INTO project_domains VALUES (?, ?)",
+                             ((domain, rows + i) for i, domains in enumerate(chunk['domains'].tolist())
+                              for domain in domains))
+            conn.executemany("INSERT INTO project_signatures VALUES (?, ?)",
+                             zip(_signature_ids(chunk, signatures), range(rows, rows + len(chunk))))
+            rows += len(chunk)
+            complex_rows += int(chunk['is_complex'].sum())
+        conn.executemany("INSERT INTO signatures VALUES (?, ?, ?, ?, ?)",
+                         ((i, specialty, complexity, duration, size)
+                          for (_, specialty, complexity, duration), (i, size) in signatures.items()))
+        conn.executemany("INSERT INTO signature_technologies VALUES (?, ?)",
+                         ((tech, i) for (techs, *_), (i, _) in signatures.items() for tech in techs))
+        conn.executescript(INDEXES)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         [(key, json.dumps(value))
+                          for key, value in dict(meta, rows=rows, complex_rows=complex_rows).items()])
+        conn.commit()
+    except BaseException:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp, db_path)
+
+
+def read_meta(db_path):
+    """meta table of a database as a dict, None if missing or unreadable"""
+    if not Path(db_path).exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def _words(tokens, operator, prefix):
+    # Tokens are [^\W_]+ words, so quoting them is enough to escape FTS5 syntax
+    star = "*" if prefix else ""
+    return f" {operator} ".join(f'"{token}"{star}' for token in tokens)
+
+
+def rank_query(tokens):
+    """FTS5 query matching any word starting with one of the tokens, in every column"""
+    return _words(tokens, "OR", prefix=True)
+
+
+def match_query(terms, fields):
+    """FTS5 query for rows with every word of one of the terms (token lists) as prefixes in the fields"""
+    columns = " ".join(fields)
+    return " OR ".join(f"{{{columns}}} : ({_words(tokens, 'AND', prefix=True)})" for tokens in terms if tokens)
+
+
+def title_query(tokens, operator):
+    """FTS5 query for titles with all (AND) or any (OR) of the words"""
+    return f"title : ({_words(tokens, operator, prefix=False)})"
+
+
+class SQLiteStore:
+    """Read-only queries on one imported database, with one connection per thread"""
+
+    def __init__(self, path, meta):
+        self.path = Path(path)
+        self.meta = meta
+        self.version = meta["version"]
+        self.rows = meta["rows"]
+        self.complex_rows = meta["complex_rows"]
+        self._uri = f"{self.path.resolve().as_uri()}?mode=ro"
+        self._local = threading.local()
+        # Open connections of every thread, dropped with their thread, so close() can reach them
+        self._connections = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._rank = f"bm25(projects_fts, {', '.join(str(FIELD_WEIGHTS[f]) for f in FTS_FIELDS)})"
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only lets close() run on another thread; each connection serves one
+            conn = self._local.conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False,
+                                                      factory=_Connection)
+            with self._lock:
+                self._connections.add(conn)
+        return conn
+
+    def close(self):
+        """Close the connection of every thread, e.g. before deleting the file; later queries fail"""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+    def _frame(self, sql, params=()):
+        """Query result as a DataFrame, JSON list columns decoded"""
+        cursor = self._conn().execute(sql, params)
+        df = pd.DataFrame.from_records(cursor.fetchall(), columns=[d[0] for d in cursor.description])
+        for col in LIST_COLUMNS:
+            if col in df:
+                df[col] = pd.Series([json.loads(v) for v in df[col].tolist()], index=df.index, dtype=object)
+        if "is_complex" in df:
+            df['is_complex'] = df['is_complex'].astype(bool)
+        return df
+
+    def _rows_by_id(self, ids):
+        """Projects with the given ids, in that order"""
+        return self._frame("SELECT p.* FROM json_each(?) j JOIN projects p ON p.id = j.value ORDER BY j.key",
+                           (json.dumps(ids),))
+
+    def _page(self, ids, params):
+        """Projects an ordered query on ids (first column) selects, in that order"""
+        return self._rows_by_id([row[0] for row in self._conn().execute(ids, params)])
+
+    def _scalar(self, sql, params=()):
+        return self._conn().execute(sql, params).fetchone()[0]
+
+    def frame(self):
+        """The whole catalogue as one DataFrame (loads every row into memory)"""
+        return self._frame("SELECT * FROM projects ORDER BY id")
+
+    def page(self, offset, limit):
+        """Projects in file order, from row offset on (ids are row numbers, so no rows are skipped over)"""
+        return self._frame("SELECT * FROM projects WHERE id >= ? ORDER BY id LIMIT ?", (offset, limit))
+
+    def value_counts(self, column, limit=None):
+        """{value: count} of a column, most frequent first, missing values left out"""
+        if column not in COUNT_COLUMNS:
+            raise ValueError(f"Cannot count by {column}")
+        rows = self._conn().execute(
+            f"SELECT {column}, COUNT(*) AS n FROM projects WHERE {column} IS NOT NULL "
+            f"GROUP BY {column} ORDER BY n DESC, MIN(id) LIMIT ?", (-1 if limit is None else limit,))
+        return dict(rows.fetchall())
+
+    def count_domain(self, domain):
+        return self._scalar("SELECT COUNT(*) FROM project_domains WHERE domain = ?", (domain,))
+
+    def search(self, rank_tokens, domain=None, match_terms=None, fields=FTS_FIELDS, limit=None, offset=0):
+        """Projects of a domain, or with every word of one of match_terms in fields, best BM25 match first.
+
+        Returns (one page as a DataFrame, total number of matches). Without
+        rank_tokens the page is in file order; in a domain, projects not
+        matching rank_tokens keep their file order after the ranked ones.
+        Only the ids are sorted; rows are read for the returned page alone.
+        """
+        limit = -1 if limit is None else limit
+        if domain is not None:
+            total = self.count_domain(domain)
+            if not rank_tokens:
+                return self._page("SELECT project_id AS id FROM project_domains WHERE domain = ? "
+                                  "ORDER BY project_id LIMIT ? OFFSET ?", (domain, limit, offset)), total
+            ids = (
+                f"WITH ranked AS MATERIALIZED ("
+                f"SELECT rowid AS id, {self._rank} AS score FROM projects_fts WHERE projects_fts MATCH ?) "
+                f"SELECT id, score FROM ("
+                f"SELECT r.id, r.score FROM ranked r JOIN project_domains d ON d.domain = ? AND d.project_id = r.id "
+                f"UNION ALL SELECT project_id, NULL FROM project_domains "
+                f"WHERE domain = ? AND project_id NOT IN (SELECT id FROM ranked)) "
+                f"ORDER BY score IS NULL, score, id LIMIT ? OFFSET ?"
+            )
+            return self._page(ids, (rank_query(rank_tokens), domain, domain, limit, offset)), total
+
+        match = match_query(match_terms or [], fields)
+        if not match:
+            return self._frame("SELECT * FROM projects LIMIT 0"), 0
+        total = self._scalar("SELECT COUNT(*) FROM projects_fts WHERE projects_fts MATCH ?", (match,))
+        order = f"{self._rank}, rowid" if rank_tokens else "rowid"
+        ids = f"SELECT rowid AS id FROM projects_fts WHERE projects_fts MATCH ? ORDER BY {order} LIMIT ? OFFSET ?"
+        return self._page(ids, (match, limit, offset)), total
+
+    def title_matches(self, tokens, operator="AND", limit=100):
+        """Projects whose title has all (AND) or any (OR) of the words, best BM25 match first"""
+        return self._page(f"SELECT rowid AS id FROM projects_fts WHERE projects_fts MATCH ? "
+                          f"ORDER BY {self._rank}, rowid LIMIT ?", (title_query(tokens, operator), limit))
+
+    def exact_title(self, title_lower):
+        """First project with exactly this lowercased title (empty DataFrame if none)"""
+        return self._frame("SELECT * FROM projects WHERE title_lower = ? ORDER BY id LIMIT 1", (title_lower,))
+
+    def score_profile(self, domains, match_score, complex_bonus, simple_bonus, k):
+        """Top k projects by match_score per matching domain plus the level bonus, and the number scoring > 0.
+
+        Projects tagged with one of the domains are read from project_domains.
+        Every other project scores its level bonus alone, so the first k of
+        each is_complex value (by its index) are the only others that can
+        make the list, and the count comes from the complex total in meta.
+        """
+        arms, params = ["SELECT id, score FROM hits"], []
+        for is_complex, bonus in ((1, complex_bonus), (0, simple_bonus)):
+            if bonus > 0:
+                arms.append(f"SELECT * FROM (SELECT id, ? FROM projects WHERE is_complex = {is_complex} "
+                            f"AND id NOT IN (SELECT id FROM hits) ORDER BY id LIMIT ?)")
+                params += [bonus, k]
+        rows = self._conn().execute(
+            f"WITH hits AS MATERIALIZED ("
+            f"SELECT d.project_id AS id, p.is_complex, COUNT(*) * ? + CASE WHEN p.is_complex THEN ? ELSE ? END AS score "
+            f"FROM project_domains d JOIN projects p ON p.id = d.project_id "
+            f"WHERE d.domain IN ({', '.join('?' * len(domains))}) GROUP BY d.project_id), "
+            f"counts AS (SELECT COUNT(*) AS tagged, COALESCE(SUM(is_complex), 0) AS tagged_complex, "
+            f"COALESCE(SUM(score > 0), 0) AS positive FROM hits), "
+            f"top AS (SELECT id, score FROM ({' UNION ALL '.join(arms)}) WHERE score > 0 ORDER BY score DESC, id LIMIT ?) "
+            f"SELECT c.tagged, c.tagged_complex, c.positive, t.id, t.score FROM counts c LEFT JOIN top t "
+            f"ORDER BY t.score DESC, t.id",
+            [match_score, complex_bonus, simple_bonus, *domains, *params, k]).fetchall()
+        tagged, tagged_complex, positive = rows[0][:3]
+        if complex_bonus > 0:
+            positive += self.complex_rows - tagged_complex
+        if simple_bonus > 0:
+            positive += self.rows - self.complex_rows - (tagged - tagged_complex)
+        rows = [row[3:] for row in rows if row[3] is not None]
+        top = self._rows_by_id([row[0] for row in rows])
+        return top, np.array([row[1] for row in rows], dtype=np.float32), positive
+
+    def similar(self, project, points, cap, limit):
+        """Projects scored against one project like calculate_similarity_score(), best first, positive only.
+
+        The score only depends on a project's signature, so the signatures
+        are scored (shared technologies through signature_technologies) and
+        the best ones supply their first members in id order, at most limit
+        each, through project_signatures.
+        """
+        techs = sorted(set(project["technologies"]))
+        groups = self._conn().execute(
+            f"SELECT s.size, s.id, MIN(?, COALESCE(t.n, 0) * ? + (s.specialty IS ?) * ? + (s.complexity IS ?) * ? "
+            f"+ (s.duration IS ?) * ?) AS score FROM signatures s LEFT JOIN ("
+            f"SELECT signature_id, COUNT(*) AS n FROM signature_technologies "
+            f"WHERE technology IN ({', '.join('?' * len(techs))}) GROUP BY signature_id) t ON t.signature_id = s.id "
+            f"WHERE score > 0 ORDER BY score DESC",
+            [cap, points["technology"], project["specialty"], points["specialty"], project["complexity"],
+             points["complexity"], project["duration"], points["duration"], *techs]).fetchall()
+
+        # limit + 1 projects fill the list once the project itself is left out;
+        # signatures tied with the last one needed compete on ids
+        members, found, cutoff = [], 0, None
+        for size, group, score in groups:
+            if cutoff is not None and score < cutoff:
+                break
+            members += [(score, row_id) for (row_id,) in self._conn().execute(
+                "SELECT project_id FROM project_signatures WHERE signature_id = ? AND project_id != ? "
+                "ORDER BY project_id LIMIT ?", (group, int(project["id"]), limit))]
+            found += size
+            if cutoff is None and found > limit:
+                cutoff = score
+        top = sorted(members, key=lambda member: (-member[0], member[1]))[:limit]
+        return self._rows_by_id([row_id for _, row_id in top]), np.array([score for score, _ in top],
+                                                                          dtype=np.float32)
+
+
+class _Connection(sqlite3.Connection):
+    """sqlite3.Connection that SQLiteStore can track weakly"""
@@ -0,0 +1,211 @@
+# src/gcrbot/tools/taxonomy.py
+from collections import deque
+
+# ============================================
+# DOMAIN AND TECHNOLOGY VOCABULARY (FR/EN)
+# ============================================
+# Single source of truth for every keyword list used by the search,
+# stats, profile and comparison features. Keywords match whole words only
+# ("ai" does not match "blockchain"), so list the variants you need.
+#
+# This replaced per-endpoint substring lists, which changes some answers:
+# - bare stems no longer match ("learning" alone is not AI/ML, "orchestr"
+#   does not match "orchestrator"); the full words are listed instead
+# - /stats domain_counts has one entry per DOMAINS label (11) and counts
+#   projects whose title or specialty mentions the domain, not title only
+# - /predict answers for the domain mentioned first in the question, not
+#   the first one in a fixed list
+
+DOMAINS = {
+    "ai": {
+        "label": "AI/ML",
+        "keywords": ["ai", "ia", "intelligence artificielle", "artificial intelligence", "machine learning",
+                     "deep learning", "incremental learning", "ml", "intelligent", "generative ai",
+                     "apprentissage automatique"],
+    },
+    "cybersecurity": {
+        "label": "Security",
+        "keywords": ["cybersecurity", "cyber security", "cyber-security", "cybersécurité", "cyber-sécurité",
+                     "cyber", "sécurité", "sécurité informatique", "security", "siem", "soar", "pentest",
+                     "soc", "xdr"],
+    },
+    "blockchain": {
+        "label": "Blockchain",
+        "keywords": ["blockchain", "iota", "crypto", "dlc", "distributed ledger"],
+    },
+    "network": {
+        "label": "Network",
+        "keywords": ["network", "networks", "networking", "réseau", "réseaux", "sd-wan", "sdn", "cisco",
+                     "routing", "ethernet", "eigrp", "ospf", "meraki"],
+    },
+    "web": {
+        "label": "Web",
+        "keywords": ["web", "website", "site web", "web development", "développement web", "platform",
+                     "plateforme", "angular", "react", "spring", "spring boot", "django", "html"],
+    },
+    "iot": {
+        "label": "IoT",
+        "keywords": ["iot", "internet of things", "internet des objets", "embedded", "sensor"],
+    },
+    "automation": {
+        "label": "Automation",
+        "keywords": ["automation", "automatisation", "automate", "automated", "automating",
+                     "process optimization"],
+    },
+    "mobile": {
+        "label": "Mobile",
+        "keywords": ["mobile", "mobile networks", "4g", "5g", "telecommunications", "télécommunications",
+                     "telecom", "ftto", "ftta"],
+    },
+    "cloud": {
+        "label": "Cloud",
+        "keywords": ["cloud", "iaac", "devops", "orchestration", "orchestrator", "terraform", "docker",
+                     "kubernetes", "infrastructure as code", "oci", "aws", "azure", "gcp"],
+    },
+    "quality": {
+        "label": "Quality",
+        "keywords": ["quality", "qualité", "testing", "qa", "test", "qos", "software quality"],
+    },
+    "computer vision": {
+        "label": "Computer Vision",
+        "keywords": ["image processing", "computer vision", "cv", "ocr", "gesture"],
+    },
+}
+
+# Skills and certifications that point a student profile to a domain
+# without describing a project (e.g. knowing Python suggests AI work)
+PROFILE_HINTS = {
+    "ai": ["python"],
+    "network": ["switching", "ccna", "ccnp"],
+    "automation": ["scripting", "ansible"],
+}
+
+TECHNOLOGIES = {
+    "Python": ["python", "py"],
+    "Machine Learning": ["ml", "machine learning", "deep learning", "incremental learning"],
+    "AI": ["ai", "intelligence artificielle", "artificial intelligence", "intelligent"],
+    "Web": ["django", "react", "angular", "web", "spring boot", "platform"],
+    "Security": ["wazuh", "siem", "soar", "cyber", "cybersecurity", "pentest", "security", "firewall",
+                 "fortinet", "palo alto"],
+    "Networking": ["eigrp", "ospf", "network", "networks", "networking", "routing", "sd-wan", "cisco", "meraki"],
+    "Mobile Networks": ["4g", "5g", "telecommunications", "ftto", "ftta"],
+    "Cloud": ["oci", "aws", "gcp", "cloud", "docker", "kubernetes"],
+    "IaaC": ["iaac", "terraform", "orchestration", "infrastructure as code"],
+    "Blockchain": ["blockchain", "iota", "dlc", "distributed ledger"],
+    "IoT": ["iot", "internet of things", "embedded", "sensor"],
+    "Automation": ["automation", "automated", "automate", "automating"],
+    "Computer Vision": ["ocr", "image processing", "computer vision", "gesture"],
+    "Quality Assurance": ["testing", "quality", "qa", "qos"]
+}
+
+# Words that carry no search meaning in FR/EN questions
+STOPWORDS = {
+    "what", "which", "is", "are", "the", "a", "an", "in", "on", "for", "with", "about", "of", "and", "or",
+    "to", "me", "show", "list", "give", "all", "any", "there", "project", "projects", "pfe",
+    "quel", "quels", "quelle", "quelles", "est", "sont", "le", "la", "les", "un", "une", "des", "du", "de",
+    "d", "l", "à", "au", "aux", "en", "dans", "sur", "pour", "et", "ou", "projet", "projets", "tous", "toutes",
+}
+
+
+# ============================================
+# AHO-CORASICK MATCHER
+# ============================================
+
+class KeywordAutomaton:
+    """Multi-pattern matcher: finds every keyword of a text in one pass.
+
+    Each keyword carries a payload (any hashable); matches are only kept
+    when they start and end on a word boundary.
+    """
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for keyword, payload in keywords.items():
+            state = 0
+            for ch in keyword:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append((len(keyword), payload))
+
+        # Breadth-first pass to wire failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def find(self, text):
+        """Yield (start, payload) for each whole-word keyword occurrence"""
+        goto, fail, output = self.goto, self.fail, self.output
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            if i + 1 < n and text[i + 1].isalnum():
+                continue
+            for length, payload in output[state]:
+                start = i - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    yield start, payload
+
+
+def _compile():
+    keywords = {}
+    for name, domain in DOMAINS.items():
+        for k in domain["keywords"]:
+            keywords.setdefault(k, []).append(("domain", name))
+    for name, hints in PROFILE_HINTS.items():
+        for k in hints:
+            keywords.setdefault(k, []).append(("hint", name))
+    for name, tech_keywords in TECHNOLOGIES.items():
+        for k in tech_keywords:
+            keywords.setdefault(k, []).append(("tech", name))
+    return KeywordAutomaton({k: tuple(tags) for k, tags in keywords.items()})
+
+
+# Compiled once at import, shared by every caller
+_automaton = _compile()
+
+
+def tag(text):
+    """Tag text with its domains, profile hints and technologies in one pass.
+
+    Returns {"domain": [...], "hint": [...], "tech": [...]}, each list in
+    order of first appearance in the text.
+    """
+    found = {"domain": {}, "hint": {}, "tech": {}}
+    if isinstance(text, str):
+        for start, tags in _automaton.find(text.lower()):
+            for kind, name in tags:
+                found[kind].setdefault(name, start)
+    return {kind: sorted(names, key=names.get) for kind, names in found.items()}
+
+
+def domains(text):
+    """Domains mentioned in text, in order of first appearance"""
+    return tag(text)["domain"]
+
+
+def technologies(text):
+    """Technologies mentioned in text, in order of first appearance"""
+    return tag(text)["tech"]
+
+
+def domain_label(domain):
+    return DOMAINS[domain]["label"]
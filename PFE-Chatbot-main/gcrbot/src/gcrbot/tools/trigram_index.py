@@ -0,0 +1,173 @@
+# src/gcrbot/tools/trigram_index.py
+import math
+import unicodedata
+
+import numpy as np
+
+from .search_index import TOKEN_RE
+
+# Rows scored by one search, whatever the catalogue size
+MAX_CANDIDATES = 1_000
+# Texts whose trigrams are extracted together while building, to bound temporary arrays
+TEXTS_PER_CHUNK = 50_000
+
+_CODE_MASK = (1 << 21) - 1
+
+
+def trigrams(text):
+    """Distinct trigrams of the words of text, padded like pg_trgm ("  c", " c ")"""
+    if not isinstance(text, str):
+        return set()
+    folded = "".join(ch for ch in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(ch))
+    grams = set()
+    for word in TOKEN_RE.findall(folded):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Trigram -> sorted row ids for typo-tolerant matching of short texts.
+
+    Stored CSR-style like InvertedIndex: the postings of vocab[i] are
+    ids[offsets[i]:offsets[i + 1]]; sizes[row] is the number of distinct
+    trigrams of that row.
+    """
+
+    def __init__(self, vocab, offsets, ids, sizes):
+        self.vocab = vocab
+        # Plain ndarray views: slicing a np.memmap costs more than the lookups themselves
+        self.offsets = np.asarray(offsets)
+        self.ids = np.asarray(ids)
+        self.sizes = np.asarray(sizes)
+        self._positions = {gram: i for i, gram in enumerate(vocab)}
+
+    @classmethod
+    def from_texts(cls, texts, chunk=TEXTS_PER_CHUNK):
+        """Index texts, the same trigrams as trigrams() but extracted from a whole chunk at once.
+
+        Each chunk of texts is joined with \\x01 and decomposed by str
+        methods running in C, then folded, split into padded words and cut
+        into trigrams with numpy.
+        Trigrams are packed as three 21-bit code points, so sorting the
+        codes sorts the trigrams like Python strings.
+        """
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        rows, grams = [], []
+        for start in range(0, len(texts), chunk):
+            chunk_rows, chunk_grams = _trigram_codes(texts[start:start + chunk])
+            rows.append(chunk_rows + start)
+            grams.append(chunk_grams)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        grams = np.concatenate(grams) if grams else np.empty(0, dtype=np.uint64)
+
+        codes = _distinct(grams)
+        gram_ids = np.searchsorted(codes, grams)
+        if len(codes) <= np.iinfo(np.uint16).max:
+            gram_ids = gram_ids.astype(np.uint16)  # Stable sort of 16-bit keys is a radix sort
+        # Rows are ascending within each trigram: pairs come in row order and the sort is stable
+        order = np.argsort(gram_ids, kind="stable")
+        offsets = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_ids, minlength=len(codes)), out=offsets[1:])
+        sizes = np.bincount(rows, minlength=len(texts)).astype(np.int32)
+        vocab = [chr(c >> 42) + chr((c >> 21) & _CODE_MASK) + chr(c & _CODE_MASK) for c in codes.tolist()]
+        return cls(vocab, offsets, rows[order], sizes)
+
+    def search(self, text, min_share=0.0, max_candidates=MAX_CANDIDATES):
+        """(rows, containment, jaccard) for the rows that can match text.
+
+        containment is the share of the query's trigrams found in the row,
+        so a few correct keywords from a long title still score 1.0;
+        jaccard also penalises the row's extra trigrams.
+
+        Only a bounded candidate set is scored, whatever the catalogue
+        size. A row sharing min_share of the query's trigrams contains one
+        of its rarest len - need + 1, so the candidates are the rows of
+        those lists, as many lists as fit in max_candidates ids. When even
+        the rarest list is longer, no query trigram is selective and its
+        first max_candidates rows are kept. Candidates are scored against
+        the other trigrams by binary search, so a common trigram such as
+        " co" costs one lookup per candidate, not a scan of its postings.
+        """
+        grams = trigrams(text)
+        found = [i for i in map(self._positions.get, grams) if i is not None]
+        need = max(1, math.ceil(min_share * len(grams)))
+        if need > len(found):
+            empty = np.empty(0)
+            return np.empty(0, dtype=np.int32), empty, empty
+        found = np.asarray(found)
+        starts, ends = self.offsets[found], self.offsets[found + 1]
+        order = np.argsort(ends - starts, kind="stable")
+        lists = [self.ids[a:b] for a, b in zip(starts[order].tolist(), ends[order].tolist())]
+
+        sizes = np.cumsum([len(postings) for postings in lists])
+        used = max(1, min(len(lists) - need + 1, int(np.searchsorted(sizes, max_candidates, side="right"))))
+        if used == 1:
+            rows = lists[0][:max_candidates]
+            shared = np.ones(len(rows), dtype=np.int64)
+        else:
+            rows, shared = np.unique(np.concatenate(lists[:used]), return_counts=True)
+        for postings in lists[used:]:
+            shared += _contains(postings, rows)
+        containment = shared / len(grams)
+        jaccard = shared / (len(grams) + self.sizes[rows] - shared)
+        return rows, containment, jaccard
+
+
+def _contains(postings, rows):
+    """Which of the sorted rows are in the sorted postings"""
+    at = np.searchsorted(postings, rows)
+    return postings[np.minimum(at, len(postings) - 1)] == rows
+
+
+def _trigram_codes(texts):
+    """(row, trigram code) of every distinct trigram of each text, ordered by row"""
+    decomposed = unicodedata.normalize("NFKD", "\x01".join(texts).lower())
+    present = set(decomposed)
+    # " " pads words; word characters ([^\W_], i.e. isalnum) follow in code point order, 0 separates
+    symbols = [" "] + sorted(ch for ch in present if ch.isalnum())
+    base = len(symbols) + 1
+    lookup = np.zeros(max(map(ord, present), default=0) + 1, dtype=np.int64)
+    lookup[[ord(ch) for ch in symbols[1:]]] = np.arange(2, base)
+    # Accents fold away: drop what unicodedata.combining() flags, as trigrams() does
+    lookup[[ord(ch) for ch in present if unicodedata.combining(ch)]] = -1
+    chars = np.frombuffer(decomposed.encode("utf-32-le"), dtype=np.uint32)
+    letters = lookup[chars]
+    keep = letters >= 0
+    chars, letters = chars[keep], letters[keep]
+
+    # Lay every word out as "  word " followed by a separator
+    is_word = letters > 0
+    starts = np.flatnonzero(is_word & ~np.concatenate(([False], is_word[:-1])))
+    positions = np.flatnonzero(is_word)
+    word = np.cumsum(np.isin(positions, starts, assume_unique=True)) - 1
+    lengths = np.bincount(word, minlength=len(starts))
+    slots = np.cumsum(lengths + 4) - (lengths + 4)
+    padded = np.zeros(len(positions) + 4 * len(starts), dtype=np.int64)
+    padded[np.arange(len(positions)) + 4 * word + 2] = letters[positions]
+    padded[slots] = padded[slots + 1] = padded[slots + 2 + lengths] = 1
+    rows = np.repeat(np.cumsum(chars == 1)[starts], lengths + 4)
+
+    whole = (padded[:-2] > 0) & (padded[1:-1] > 0) & (padded[2:] > 0)
+    grams = ((padded[:-2] * base + padded[1:-1]) * base + padded[2:])[whole]
+    rows = rows[:-2][whole]
+    span = base ** 3
+    if span * max(len(texts), 1) >= 2 ** 63:
+        # Huge alphabets: number the chunk's distinct trigrams first so the keys fit in int64
+        distinct = _distinct(grams)
+        keys = _distinct(rows * len(distinct) + np.searchsorted(distinct, grams))
+        rows, grams = keys // len(distinct), distinct[keys % len(distinct)]
+    else:
+        keys = _distinct(rows * span + grams)
+        rows, grams = keys // span, keys % span
+
+    code_points = np.array([0] + [ord(ch) for ch in symbols], dtype=np.uint64)
+    codes = (code_points[grams // (base * base)] << np.uint64(42)) | (code_points[grams // base % base] << np.uint64(21)) \
+        | code_points[grams % base]
+    return rows.astype(np.int32), codes
+
+
+def _distinct(values):
+    """Sorted distinct values (np.unique, minus the hashing pass it runs first on recent numpy)"""
+    values = np.sort(values)
+    return values[np.concatenate(([True], values[1:] != values[:-1]))] if len(values) else values